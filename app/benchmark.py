@@ -0,0 +1,228 @@
+"""
+Reproducible benchmark for both models.
+
+    python -m app.benchmark [--tasks sentiment,image] [--out bench.json] [--compare old.json]
+
+For each model it measures:
+  - cold load time (fresh subprocess: imports + weights)
+  - warm single-item latency p50/p95/p99 (cache cleared before every call)
+  - batched throughput (items/sec) for several batch sizes
+  - cache-hit latency p50/p99
+  - peak RSS (each task runs in its own subprocess, so this is that model alone)
+  - per-stage latency (cache_lookup/preprocess/forward/postprocess) from app.utils.metrics
+Results are written as JSON; --compare prints the change against an older run.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+from app.models.registry import registry
+from app.utils.metrics import metrics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_WORDS = (
+    "great terrible movie service food phone battery screen staff price quality "
+    "delivery slow fast friendly rude love hate amazing awful recommend never again"
+).split()
+
+
+def _texts(n: int, seed: int = 0):
+    # Deterministic, all distinct, lengths between 6 and 40 words
+    out = []
+    for i in range(n):
+        k = 6 + (i * 7 + seed) % 35
+        out.append(f"{i} " + " ".join(_WORDS[(i * 3 + j * 5 + seed) % len(_WORDS)] for j in range(k)))
+    return out
+
+
+def _images(n: int, seed: int = 0):
+    from PIL import Image
+
+    # Distinct flat-colour 640x480 images so every one is a cache miss
+    return [
+        Image.new("RGB", (640, 480), ((i * 37 + seed) % 256, (i * 91) % 256, (i * 53 + 7) % 256))
+        for i in range(n)
+    ]
+
+
+INPUTS = {"sentiment": _texts, "image": _images}
+
+
+def _pct(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def cold_load(task: str) -> float:
+    """Seconds to import and load the model in a brand new interpreter."""
+    code = (
+        "import time; t = time.perf_counter(); "
+        "from app.models.registry import registry; "
+        f"registry.load({task!r}); print(time.perf_counter() - t)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def bench_task(task: str, iterations: int, batch_sizes, cold: bool = True) -> dict:
+    result = {}
+    if cold:
+        result["cold_load_sec"] = round(cold_load(task), 3)
+
+    t = time.perf_counter()
+    model = registry.load(task)
+    result["warm_process_load_sec"] = round(time.perf_counter() - t, 3)
+    make = INPUTS[task]
+    model.infer(make(1, seed=99)[0])  # warm-up
+
+    # Single-item latency on the cache-miss path
+    latencies = []
+    for item in make(iterations, seed=1):
+        model._cache.clear()
+        t = time.perf_counter()
+        model.infer(item)
+        latencies.append(time.perf_counter() - t)
+    result["single"] = {
+        "n": iterations,
+        "p50_ms": _ms(statistics.median(latencies)),
+        "p95_ms": _ms(_pct(latencies, 95)),
+        "p99_ms": _ms(_pct(latencies, 99)),
+        "mean_ms": _ms(statistics.mean(latencies)),
+    }
+
+    # Throughput through infer_batch for each batch size
+    result["batch"] = {}
+    for bs in batch_sizes:
+        items = make(max(bs * 4, iterations), seed=bs)
+        model._cache.clear()
+        t = time.perf_counter()
+        model.infer_batch(items, batch_size=bs)
+        elapsed = time.perf_counter() - t
+        result["batch"][str(bs)] = {
+            "n": len(items),
+            "items_per_sec": round(len(items) / elapsed, 2),
+            "ms_per_item": _ms(elapsed / len(items)),
+        }
+
+    # Cache hits: same input over and over
+    item = make(1, seed=42)[0]
+    model.infer(item)
+    hits = []
+    for _ in range(iterations * 10):
+        t = time.perf_counter()
+        model.infer(item)
+        hits.append(time.perf_counter() - t)
+    result["cache_hit"] = {
+        "p50_ms": _ms(statistics.median(hits)),
+        "p99_ms": _ms(_pct(hits, 99)),
+    }
+
+    # Stage breakdown over every call above (warm-up included)
+    stages = metrics.to_json(model.variant_name()).get(model.variant_name(), {})
+    result["stages"] = {
+        stage: {k: snap[k] for k in ("count", "p50_ms", "p99_ms", "mean_ms")}
+        for stage, snap in stages.items()
+    }
+
+    # Process-wide high-water mark: only meaningful because bench_isolated()
+    # gives every task a fresh interpreter
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    result["peak_rss_mb"] = round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    return result
+
+
+def bench_isolated(task: str, iterations: int, batch_sizes, cold: bool = True) -> dict:
+    """bench_task() in a brand new interpreter, so earlier tasks can't inflate its peak RSS."""
+    cmd = [
+        sys.executable, "-m", "app.benchmark", "--worker", task,
+        "--iterations", str(iterations), "--batch-sizes", ",".join(map(str, batch_sizes)),
+    ]
+    if not cold:
+        cmd.append("--no-cold")
+    # stderr is inherited so model logs and tracebacks stay visible
+    out = subprocess.run(cmd, cwd=ROOT, stdout=subprocess.PIPE, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def environment() -> dict:
+    env = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    for mod in ("torch", "transformers"):
+        try:
+            env[mod] = getattr(__import__(mod), "__version__", None)
+        except ImportError:
+            env[mod] = None
+    return env
+
+
+def _flatten(d, prefix=""):
+    for k, v in d.items():
+        if isinstance(v, dict):
+            yield from _flatten(v, f"{prefix}{k}.")
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            yield f"{prefix}{k}", v
+
+
+def compare(old: dict, new: dict) -> None:
+    """Print every numeric metric with its relative change."""
+    before = dict(_flatten(old["results"]))
+    for key, value in _flatten(new["results"]):
+        if key in before and before[key]:
+            change = (value - before[key]) / before[key] * 100
+            print(f"{key:<45} {before[key]:>12} -> {value:>12}  ({change:+.1f}%)")
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark model load, latency, throughput and cache hits")
+    p.add_argument("--tasks", default="sentiment,image")
+    p.add_argument("--iterations", type=int, default=30, help="Samples for latency percentiles")
+    p.add_argument("--batch-sizes", default="1,8,32")
+    p.add_argument("--no-cold", action="store_true", help="Skip the subprocess cold-load measurement")
+    p.add_argument("--out", help="Write JSON results here (default: stdout)")
+    p.add_argument("--compare", help="Earlier JSON results to diff against")
+    p.add_argument("--worker", help=argparse.SUPPRESS)  # internal: bench one task, print JSON
+    args = p.parse_args()
+
+    batch_sizes = [int(b) for b in args.batch_sizes.split(",") if b.strip()]
+    if args.worker:
+        from app.utils.disk_cache import configure_disk_cache
+
+        configure_disk_cache(None)  # measure the model, not a warm $APP_CACHE_DB
+        print(json.dumps(bench_task(args.worker, args.iterations, batch_sizes, not args.no_cold)))
+        return
+
+    report = {"environment": environment(), "results": {}}
+    for task in [t.strip() for t in args.tasks.split(",") if t.strip()]:
+        report["results"][task] = bench_isolated(task, args.iterations, batch_sizes, not args.no_cold)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as fh:
+            fh.write(text)
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare) as fh:
+            compare(json.load(fh), report)
+
+
+if __name__ == "__main__":
+    main()
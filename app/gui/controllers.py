@@ -1,6 +1,10 @@
+import os
+import time
 import tkinter as tk
 from tkinter import filedialog
 
+from app.gui.worker import InferenceWorker
+
 # Lazy import - only import when needed
 # from app.gui.tasks import BaseTask, SentimentTask, ImageTask
 
@@ -14,7 +18,10 @@ class AppController:
 
     def __init__(self):
         self._task = None  # Will hold BaseTask instance
+        self._tasks = {}  # Task instances reused across runs, keyed by kind
         self.model_var = tk.StringVar(value="Sentiment")
+        self.warm_up = None  # WarmUp tracker once start_warm_up() runs
+        self.worker = InferenceWorker()  # one background thread runs every queued job
 
     def select_task(self, name: str):
         # Lazy import to avoid loading ML models at startup
@@ -22,23 +29,102 @@ class AppController:
 
         name = (name or "").lower()
         if name.startswith("sent"):
-            print(f"Selecting SentimentTask for model: {name}")
-            self._task = SentimentTask()
+            kind, task_cls = "sentiment", SentimentTask
         elif name.startswith("image"):
-            print(f"Selecting ImageTask for model: {name}")
-            self._task = ImageTask()
+            kind, task_cls = "image", ImageTask
         else:
             raise ValueError(f"Unknown task selected: {name}")
+
+        if kind not in self._tasks:
+            print(f"Selecting {task_cls.__name__} for model: {name}")
+            self._tasks[kind] = task_cls()
+        self._task = self._tasks[kind]
         return self._task
 
+    def start_warm_up(self, tasks=None):
+        """
+        Load and warm models on a background thread so the first click doesn't
+        pay for it. Defaults to $APP_WARM_TASKS or "sentiment,image"; an empty
+        value turns warm-up off. Returns the WarmUp tracker (None when off).
+        """
+        from app.models.registry import WarmUp
+
+        if tasks is None:
+            tasks = os.environ.get("APP_WARM_TASKS", "sentiment,image").split(",")
+        tasks = [t.strip() for t in tasks if t.strip()]
+        if not tasks:
+            return None
+        self.warm_up = WarmUp(tasks)
+        self.warm_up.start()
+        return self.warm_up
+
+    @staticmethod
+    def model_stats() -> list:
+        """Load time / memory of every model currently held by the registry"""
+        from app.models.registry import registry
+
+        return registry.stats()
+
     def current_task(self):
         return self._task
 
+    def submit_inference(
+        self, model_name: str, input_kind: str, text_value: str = "", image_path: str = ""
+    ):
+        """Queue one run on the background worker; returns its Job"""
+        return self.worker.submit(
+            lambda job: self.run_inference(input_kind, text_value, image_path, model_name),
+            label=(text_value[:40] or image_path.split("/")[-1]),
+            model=model_name,
+            view="run",
+        )
+
+    def submit_batch(self, model_name: str, items: list, chunk_size: int = 16):
+        """Queue a batch run (texts or image paths) on the background worker"""
+        items = list(items)
+        return self.worker.submit(
+            lambda job: self.run_batch(job, model_name, items, chunk_size),
+            label=f"{len(items)} {model_name.lower()} items",
+            model=model_name,
+            view="batch",
+        )
+
+    def run_batch(self, job, model_name: str, items: list, chunk_size: int = 16) -> dict:
+        """
+        Runs on the worker thread. Items go through the task's batched path
+        chunk by chunk; after each chunk the new rows (index, item, result,
+        latency_sec, error) are reported with job.progress(), which is also
+        where a cancelled batch stops. A failing chunk is retried item by item
+        so one bad file doesn't sink its neighbours.
+        """
+        task = self.select_task(model_name)
+        done = 0
+        for start in range(0, len(items), chunk_size):
+            part = items[start:start + chunk_size]
+            t = time.perf_counter()
+            try:
+                outs = task.run(part)
+                per_item = (time.perf_counter() - t) / len(part)
+                rows = [(start + i, item, out, per_item, None) for i, (item, out) in enumerate(zip(part, outs))]
+            except Exception:
+                rows = []
+                for i, item in enumerate(part):
+                    t = time.perf_counter()
+                    try:
+                        out, error = task.run(item), None
+                    except Exception as e:
+                        out, error = None, str(e)
+                    rows.append((start + i, item, out, time.perf_counter() - t, error))
+            done += len(part)
+            job.progress(done, len(items), rows)
+        return {"count": done}
+
     def run_inference(
-        self, input_kind: str, text_value: str = "", image_path: str = ""
+        self, input_kind: str, text_value: str = "", image_path: str = "", model_name: str = None
     ) -> dict:
-        # Always select the correct task based on current model selection
-        current_model = self.model_var.get()
+        # Select the task for the given model (or the current selection). The
+        # worker thread always passes model_name: Tk variables are main-thread only
+        current_model = model_name or self.model_var.get()
         self.select_task(current_model)
 
         if input_kind == "Text":
@@ -53,6 +139,32 @@ class AppController:
 
         raise ValueError("Unsupported input kind.")
 
+    def pick_files(self, parent) -> list:
+        return list(
+            filedialog.askopenfilenames(
+                parent=parent,
+                title="Choose images",
+                filetypes=[
+                    ("Image files", "*.jpg *.jpeg *.png *.bmp *.gif *.webp"),
+                    ("All files", "*.*"),
+                ],
+            )
+            or []
+        )
+
+    @staticmethod
+    def images_in_folder(folder: str) -> list:
+        from app.utils.streaming import iter_image_files
+
+        return [path for _, path in iter_image_files(folder)]
+
+    @staticmethod
+    def texts_in_file(path: str) -> list:
+        """Sentences from a .txt (one per line), .csv or .jsonl file"""
+        from app.utils.streaming import read_text_records
+
+        return [text for _, text in read_text_records(path)]
+
     def pick_file(self, parent) -> str:
         return (
             filedialog.askopenfilename(
@@ -77,7 +189,7 @@ class AppController:
     def oop_explanations() -> str:
         return (
             "OOP Concepts Used:\n"
-            "• Multiple inheritance: model classes combine HFModelBase + LoggingMixin + CachingMixin.\n"
+            "• Multiple inheritance: model classes combine HFModelBase + LoggingMixin + CachingMixin + AsyncMixin.\n"
             "• Multiple decorators: @timed and @validate_input wrap model methods to time & validate inputs.\n"
             "• Encapsulation: private/protected attributes (e.g., _model, _last_result) with getters/setters.\n"
             "• Polymorphism: BaseTask.run() is called uniformly; SentimentTask & ImageTask override run().\n"
@@ -0,0 +1,60 @@
+import datetime
+import itertools
+import json
+from collections import deque
+from typing import Any, Dict, List
+
+
+class ResultHistory:
+    """
+    Bounded ring buffer of structured results for the Output tab.
+    Once max_results is reached the oldest record is dropped, so memory and
+    rendering cost stay flat over a day-long session. Record ids keep counting
+    up, which lets the view find a record by id even after older ones drop.
+    """
+
+    def __init__(self, max_results: int = 5000):
+        self._records: deque = deque(maxlen=max_results)
+        self._ids = itertools.count(1)
+        self.dropped = 0  # records pushed out of the buffer so far
+
+    def append(self, model: str | None, result: Any, source: str = "", error: str | None = None) -> Dict[str, Any]:
+        if len(self._records) == self._records.maxlen:
+            self.dropped += 1
+        record = {
+            "id": next(self._ids),
+            "time": datetime.datetime.now().isoformat(timespec="seconds"),
+            "model": model,
+            "input": source,
+            "result": result,
+            "error": error,
+        }
+        self._records.append(record)
+        return record
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return self._records[index]
+
+    def index_of(self, record_id: int) -> int | None:
+        # Ids are consecutive inside the buffer, so this is O(1)
+        if not self._records:
+            return None
+        index = record_id - self._records[0]["id"]
+        return index if 0 <= index < len(self._records) else None
+
+    def window(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        return list(itertools.islice(self._records, max(start, 0), max(stop, 0)))
+
+    def clear(self) -> None:
+        self._records.clear()
+        self.dropped = 0
+
+    def export_jsonl(self, path: str) -> int:
+        """Write every retained record as one JSON object per line; returns the count."""
+        with open(path, "w", encoding="utf-8") as fh:
+            for record in self._records:
+                fh.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        return len(self._records)
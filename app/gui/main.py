@@ -2,7 +2,7 @@ import tkinter as tk
 from tkinter import ttk
 
 from app.gui.controllers import AppController
-from app.gui.views import InputFrame, OutputFrame, InfoFrame, OOPFrame
+from app.gui.views import BatchFrame, InputFrame, OutputFrame, InfoFrame, OOPFrame
 
 
 def main():
@@ -30,11 +30,13 @@ def main():
     # Create tabs with icons in names
     input_tab = ttk.Frame(nb)
     output_tab = ttk.Frame(nb)
+    batch_tab = ttk.Frame(nb)
     info_tab = ttk.Frame(nb)
     oop_tab = ttk.Frame(nb)
 
     nb.add(input_tab, text="🚀 Run Analysis")
     nb.add(output_tab, text="📊 Output")
+    nb.add(batch_tab, text="📦 Batch")
     nb.add(info_tab, text="ℹ️ Model Info")
     nb.add(oop_tab, text="🏗️ OOP Concepts")
 
@@ -45,6 +47,9 @@ def main():
     input_frame = InputFrame(input_tab, controller, output_frame, notebook=nb)
     input_frame.pack(expand=True, fill="both", padx=8, pady=8)
 
+    batch_frame = BatchFrame(batch_tab, controller)
+    batch_frame.pack(expand=True, fill="both", padx=8, pady=8)
+
     info_frame = InfoFrame(info_tab, controller)
     info_frame.pack(expand=True, fill="both", padx=8, pady=8)
 
@@ -58,6 +63,7 @@ def main():
     # File menu
     file_menu = tk.Menu(menubar, tearoff=0)
     file_menu.add_command(label="🔄 Clear Output", command=output_frame.clear)
+    file_menu.add_command(label="💾 Export Results (JSONL)", command=output_frame.export_history)
     file_menu.add_separator()
     file_menu.add_command(label="ℹ️ About", command=lambda: show_about(root))
     file_menu.add_separator()
@@ -70,6 +76,7 @@ def main():
     view_menu.add_command(
         label="📊 Go to Output", command=lambda: nb.select(output_tab)
     )
+    view_menu.add_command(label="📦 Go to Batch", command=lambda: nb.select(batch_tab))
     view_menu.add_command(
         label="ℹ️ Go to Model Info", command=lambda: nb.select(info_tab)
     )
@@ -90,9 +97,45 @@ def main():
     version_label = ttk.Label(status_frame, text="v1.0", relief="sunken")
     version_label.pack(side="right", padx=(0, 4))
 
+    # Load the models in the background and show their progress in the status bar
+    warm_up = controller.start_warm_up()
+    if warm_up is not None:
+        poll_warm_up(root, warm_up, status_label)
+
+    # Results from the background worker are delivered on the Tk main loop
+    poll_worker(root, controller.worker, input_frame, batch_frame)
+
     root.mainloop()
 
 
+def poll_worker(root, worker, input_frame, batch_frame, interval_ms: int = 100):
+    """Hand the worker's events to the tabs, then check again after interval_ms"""
+    for kind, job, data in worker.poll():
+        input_frame.on_job_event(kind, job, data)
+        batch_frame.on_job_event(kind, job, data)
+    input_frame.refresh_queue_status()
+    root.after(interval_ms, poll_worker, root, worker, input_frame, batch_frame, interval_ms)
+
+
+def poll_warm_up(root, warm_up, status_label, interval_ms: int = 250):
+    """Refresh the status bar from the warm-up thread's state until it finishes"""
+    icons = {"pending": "⏸", "loading": "⏳", "ready": "✅", "error": "❌"}
+    state = warm_up.state()
+    parts = []
+    for task, s in state["models"].items():
+        took = f" {state['seconds'][task]:.1f}s" if task in state["seconds"] else ""
+        parts.append(f"{task} {icons.get(s, s)}{took}")
+
+    if not warm_up.done:
+        status_label.configure(text="Loading models… " + ", ".join(parts))
+        root.after(interval_ms, poll_warm_up, root, warm_up, status_label, interval_ms)
+    elif state["errors"]:
+        failed = ", ".join(f"{t} ({e})" for t, e in state["errors"].items())
+        status_label.configure(text=f"Model warm-up failed: {failed}")
+    else:
+        status_label.configure(text="Ready - models loaded: " + ", ".join(parts))
+
+
 def show_about(parent):
     """Show about dialog"""
     from tkinter import messagebox
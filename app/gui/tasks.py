@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 
 # Lazy import - only import models when needed
 # from app.models.sentiment_model import SentimentModel
-# from app.models.image_model import ImageClassifier
+# from app.models.image_classifier import ImageClassifier
 
 
 class BaseTask(ABC):
@@ -40,7 +40,7 @@ class ImageTask(BaseTask):
         """Run image classification on image file path"""
         if self.model is None:
             print("Loading image classification model...")
-            from app.models.image_model import ImageClassifier
+            from app.models.image_classifier import ImageClassifier
 
             self.model = ImageClassifier()
         return self.model.infer(data)
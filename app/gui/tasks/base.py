@@ -1,7 +1,19 @@
+from app.models.registry import registry
+
+
 class BaseTask:
-    
-    def __init__(self):
+    TASK = None  # registry task name of the model this task runs
+
+    def __init__(self, model_id: str = None):
         self._last_result = None  # encapsulated state
+        self._model_id = model_id
+
+    @property
+    def _model(self):
+        # Looked up in the registry on every use rather than held, so
+        # registry.unload() really frees the weights and the next get()
+        # never loads a second copy next to one a task still references
+        return registry.get(self.TASK, self._model_id)
 
     def run(self, data):
         raise NotImplementedError("Subclasses must override run()")
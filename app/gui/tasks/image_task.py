@@ -1,19 +1,27 @@
-from PIL import Image
-from app.models.image_classifier import ImageClassifier
+from app.models.registry import registry
 from .base import BaseTask
 
 
 class ImageTask(BaseTask):
     """Runs image classification using ImageClassifier (MobileViT X-Small)."""
 
-    def __init__(self):
-        super().__init__()
-        self._model = ImageClassifier()
+    TASK = "image"
+
+    def __init__(self, model_id: str = None):
+        super().__init__(model_id)
+        # Shared instance from the registry, loaded once per process
+        registry.get(self.TASK, model_id)
 
     # Method overriding
-    def run(self, data) -> dict:
-        img = Image.open(data) if isinstance(data, str) else data
-        out = self._model.infer(img)
+    def run(self, data):
+        # A list of paths/images goes through the batched, parallel-decode path
+        if isinstance(data, (list, tuple)):
+            out = self._model.infer_batch(data)
+            self._set_last_result(out)
+            return out
+        # Paths go straight to the model: it hashes the file bytes for the cache
+        # and opens the file itself, so JPEGs can use reduced-size decoding
+        out = self._model.infer(data)
         self._set_last_result(out)
         return out
 
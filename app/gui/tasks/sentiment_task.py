@@ -1,20 +1,27 @@
-from app.models.sentiment_model import SentimentModel
+from app.models.registry import registry
 from .base import BaseTask
 
 
 class SentimentTask(BaseTask):
     """Runs text sentiment inference using SentimentModel."""
 
-    def __init__(self):
-        super().__init__()
-        # Encapsulation: keep model private-ish
-        self._model = SentimentModel()
+    TASK = "sentiment"
+
+    def __init__(self, model_id: str = None):
+        super().__init__(model_id)
+        # Encapsulation: keep model private-ish. The registry hands out a shared
+        # instance so creating a task never reloads the pipeline.
+        registry.get(self.TASK, model_id)
 
     # Method overriding
-    def run(self, data: str) -> dict:
-        out = self._model.infer(data)
+    def run(self, data):
+        # A list of texts goes through the batched path and returns a list
+        if isinstance(data, (list, tuple)):
+            out = self._model.infer_batch(data)
+        else:
+            out = self._model.infer(data)
         self._set_last_result(out)
         return out
 
     def info(self) -> str:
-        return "Sentiment analysis (Transformers). Input: text. Output: label + score."
+        return "Sentiment analysis (Transformers). Input: text or list of texts. Output: label + score."
@@ -1,6 +1,8 @@
+import time
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
-import threading
+from tkinter import ttk, scrolledtext, messagebox, filedialog
+from app.gui.history import ResultHistory
+from app.gui.widgets import VirtualList
 
 
 class InputFrame(ttk.Frame):
@@ -17,6 +19,8 @@ class InputFrame(ttk.Frame):
         self.status_label.pack(side="left")
         self.progress = ttk.Progressbar(status_frame, mode="indeterminate")
         self.progress.pack(side="right", padx=(10, 0))
+        self.queue_label = ttk.Label(status_frame, text="", foreground="gray")
+        self.queue_label.pack(side="right")
 
         # Model selection
         ttk.Label(self, text="Select Model:").grid(row=1, column=0, sticky="w")
@@ -74,6 +78,10 @@ class InputFrame(ttk.Frame):
             btns, text="🚀 Run Analysis", command=self._run, style="Accent.TButton"
         )
         self.run_btn.pack(side="left", padx=4)
+        self.cancel_btn = ttk.Button(
+            btns, text="⏹ Cancel", command=self._cancel, state="disabled"
+        )
+        self.cancel_btn.pack(side="left", padx=4)
         ttk.Button(btns, text="Clear", command=self._clear).pack(side="left", padx=4)
         ttk.Button(btns, text="View Output", command=self._switch_to_output).pack(
             side="left", padx=4
@@ -160,63 +168,99 @@ class InputFrame(ttk.Frame):
             input_kind = "Image"
             text_input = ""
 
-        # Start processing animation
+        # Queue the job; the persistent worker runs jobs one after another so
+        # the user can keep submitting while earlier ones are still running
+        job = self.controller.submit_inference(
+            model_name, input_kind, text_value=text_input, image_path=image_path
+        )
         self.status_label.configure(
-            text=f"Processing with {model_name} model...", foreground="orange"
+            text=f"Queued job #{job.id} ({model_name})", foreground="orange"
         )
-        self.progress.start(10)
-        self.run_btn.configure(state="disabled", text="Processing...")
-
-        # Update UI
-        self.update()
-
-        def run_inference():
-            try:
-                res = self.controller.run_inference(
-                    input_kind=input_kind,
-                    text_value=text_input,
-                    image_path=image_path,
-                )
-
-                # Update UI in main thread
-                self.after(0, self._inference_complete, res, None)
-
-            except Exception as e:
-                self.after(0, self._inference_complete, None, str(e))
-
-        # Run in background thread to prevent UI freezing
-        threading.Thread(target=run_inference, daemon=True).start()
-
-    def _inference_complete(self, result, error):
-        """Called when inference is complete"""
-        # Stop progress animation
-        self.progress.stop()
-        self.run_btn.configure(state="normal", text="🚀 Run Analysis")
-
-        if error:
-            self.status_label.configure(text=f"Error: {error}", foreground="red")
-            messagebox.showerror("Processing Error", error)
-        else:
+
+    def _cancel(self):
+        """Cancel this tab's queued jobs and the one that is running"""
+        jobs = [j for j in self.controller.worker.pending() if j.meta.get("view") == "run"]
+        for job in jobs:
+            job.cancel()
+        count = len(jobs)
+        if count:
             self.status_label.configure(
-                text="✅ Analysis complete! Check Output tab", foreground="green"
+                text=f"Cancelling {count} job{'s' if count != 1 else ''}...",
+                foreground="orange",
             )
 
-            # Send result to output frame
+    def on_job_event(self, kind, job, data):
+        """Worker event pumped from the Tk loop (see main.poll_worker)"""
+        if job.meta.get("view") != "run":
+            return
+        model_name = job.meta.get("model")
+        if kind == "started":
+            self.progress.configure(mode="indeterminate")
+            self.progress.start(10)
+        elif kind == "progress":
+            done, total, _ = data
+            self.progress.stop()
+            self.progress.configure(mode="determinate", maximum=max(total, 1), value=done)
+        elif kind == "done":
             if self.output_frame:
-                model_name = self.controller.model_var.get()
-                self.output_frame.display_result(result, model_name)
+                self.output_frame.display_result(data, model_name, source=job.label)
+            self.status_label.configure(
+                text=f"✅ Job #{job.id} complete! Check Output tab", foreground="green"
+            )
+        elif kind == "error":
+            if self.output_frame:
+                self.output_frame.display_error(data, model_name, source=job.label)
+            self.status_label.configure(
+                text=f"Job #{job.id} failed: {data}", foreground="red"
+            )
+        elif kind == "cancelled":
+            self.status_label.configure(
+                text=f"Job #{job.id} cancelled", foreground="gray"
+            )
 
-            # Show notification and offer to switch to output tab
-            if messagebox.askyesno(
-                "Analysis Complete",
-                "Analysis finished successfully!\n\nWould you like to view the results in the Output tab?",
-            ):
-                self._switch_to_output()
+    def refresh_queue_status(self):
+        """Progress bar, Cancel button and queue summary from the worker state"""
+        pending = self.controller.worker.pending()
+        mine = [j for j in pending if j.meta.get("view") == "run"]
+        if not any(j.state == "running" for j in mine):
+            self.progress.stop()
+            self.progress.configure(value=0)
+        self.cancel_btn.configure(state="normal" if mine else "disabled")
+        if not pending:
+            self.queue_label.configure(text="")
+            return
+        running = [j for j in pending if j.state == "running"]
+        queued = len(pending) - len(running)
+        text = f"Running #{running[0].id}" if running else "Starting"
+        if queued:
+            text += f", {queued} queued"
+        self.queue_label.configure(text=text)
 
 
 class OutputFrame(ttk.Frame):
+    """
+    Results of the session: a bounded history (ResultHistory), a virtualised
+    one-row-per-result list and a detail pane for the selected result.
+    Each new result costs one row redraw and one detail insert, however long
+    the session has been running.
+    """
+
+    max_results = 5000  # older results are dropped from the view (export first)
+
+    WELCOME = """🤖 AI Model Analysis Results will appear here
+
+• Select a model and provide input in the 'Run' tab
+• Click 'Run Analysis' to process your input
+• Results appear in the list above, newest at the bottom; click one for details
+• Use 'Export JSONL' to save the whole history
+
+Ready for analysis! 🚀
+"""
+
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
+        self.history = ResultHistory(self.max_results)
+        self._selected_id = None  # None = follow the newest result
 
         # Header with status
         header = ttk.Frame(self)
@@ -225,12 +269,21 @@ class OutputFrame(ttk.Frame):
         ttk.Label(
             header, text="Analysis Results:", font=("TkDefaultFont", 10, "bold")
         ).pack(side="left")
+        ttk.Button(header, text="💾 Export JSONL", command=self.export_history).pack(
+            side="right", padx=(6, 0)
+        )
         self.result_count_label = ttk.Label(
             header, text="No results yet", foreground="gray"
         )
         self.result_count_label.pack(side="right")
 
-        # Output text area with better styling
+        # Only the rows on screen are ever rendered
+        self.rows = VirtualList(
+            self, lambda: len(self.history), self._row_text, on_select=self._on_select, height=10
+        )
+        self.rows.pack(fill="both", expand=True, padx=4, pady=(4, 0))
+
+        # Detail of the selected (or newest) result
         self.out = scrolledtext.ScrolledText(
             self,
             width=70,
@@ -241,64 +294,84 @@ class OutputFrame(ttk.Frame):
             borderwidth=2,
         )
         self.out.pack(expand=True, fill="both", padx=4, pady=4)
+        self._show_detail(self.WELCOME)
+
+    def display_error(self, message, model_name=None, source=""):
+        """Show a failed job in the results instead of a modal dialog"""
+        self._add(model_name, None, source, error=str(message))
+
+    def display_result(self, result, model_name=None, source=""):
+        """Add a result to the history and show it"""
+        self._add(model_name, result, source)
+
+    def _add(self, model_name, result, source, error=None):
+        at_bottom = self.rows.at_bottom  # keep scrolling with new rows only if already there
+        record = self.history.append(model_name, result, source, error=error)
+        if self._selected_id is None:  # following the newest result
+            self._show_detail(self._format_record(record))
+        self._refresh_rows(follow=at_bottom)
+        self._update_count()
+
+    def _refresh_rows(self, follow=False):
+        if self._selected_id is None:
+            self.rows.selected = len(self.history) - 1 if len(self.history) else None
+        else:
+            self.rows.selected = self.history.index_of(self._selected_id)
+        self.rows.refresh(follow=follow)
 
-        # Add welcome message
-        welcome_msg = """🤖 AI Model Analysis Results will appear here
-
-• Select a model and provide input in the 'Run' tab
-• Click 'Run Analysis' to process your input
-• Results will automatically appear here with timestamps
-
-Ready for analysis! 🚀
-"""
-        self.out.insert("1.0", welcome_msg)
-        self.out.configure(state="disabled")
-
-        self.result_count = 0
-        self.master.bind("<<ShowResult>>", self._on_result)
+    def _on_select(self, index):
+        record = self.history[index]
+        # Clicking the newest row goes back to following new results
+        self._selected_id = None if index == len(self.history) - 1 else record["id"]
+        self._show_detail(self._format_record(record))
 
-    def _on_result(self, event):
+    def _show_detail(self, text):
+        # One insert per result instead of one per line
         self.out.configure(state="normal")
-        self.out.insert("end", event.data + "\n")
-        self.out.see("end")
+        self.out.delete("1.0", "end")
+        self.out.insert("1.0", text)
         self.out.configure(state="disabled")
 
-    def display_result(self, result, model_name=None):
-        """Display result with proper formatting based on model type"""
-        import datetime
-
-        self.out.configure(state="normal")
-
-        # Clear welcome message on first result
-        if self.result_count == 0:
-            self.out.delete("1.0", "end")
-
-        self.result_count += 1
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+    def _update_count(self):
+        n = len(self.history)
+        text = f"{n} result{'s' if n != 1 else ''}"
+        if self.history.dropped:
+            text += f" (oldest {self.history.dropped} dropped)"
+        self.result_count_label.configure(text=text, foreground="green")
+
+    def _row_text(self, index):
+        """One line per result for the list"""
+        record = self.history[index]
+        result = record["result"]
+        if record["error"]:
+            summary = f"❌ {record['error']}"
+        elif isinstance(result, dict):
+            summary = f"{result.get('label', '?')} {result.get('score', 0.0):.1%}"
+        elif isinstance(result, list):
+            summary = f"{len(result)} items"
+        else:
+            summary = str(result)
+        source = f"  {record['input'][:40]}" if record["input"] else ""
+        return (
+            f"#{record['id']:<5} {record['time'][11:]}  {record['model'] or '':<9} "
+            f"{summary[:60]}{source}"
+        )
 
-        # Add formatted result with separator
+    def _format_record(self, record):
+        """Full text for the detail pane"""
         separator = "=" * 60
-        header = f"\n{separator}\n🔍 Analysis #{self.result_count} - {timestamp}\n{separator}\n"
-
-        self.out.insert("end", header)
-
-        # Format output based on model type
-        if model_name == "Image" and isinstance(result, dict):
-            self._format_image_result(result)
+        header = f"{separator}\n🔍 Analysis #{record['id']} - {record['time'][11:]}\n{separator}\n"
+        model_name, result = record["model"], record["result"]
+        if record["error"]:
+            body = f"❌ {model_name or 'Model'} error: {record['error']}\n"
+        elif model_name == "Image" and isinstance(result, dict):
+            body = self._format_image_result(result)
         elif model_name == "Sentiment" and isinstance(result, dict):
-            self._format_sentiment_result(result)
+            body = self._format_sentiment_result(result)
         else:
             # Fallback to string representation
-            self.out.insert("end", f"{result}\n")
-
-        self.out.see("end")
-        self.out.configure(state="disabled")
-
-        # Update result count
-        self.result_count_label.configure(
-            text=f"{self.result_count} result{'s' if self.result_count != 1 else ''}",
-            foreground="green",
-        )
+            body = f"{result}\n"
+        return header + body
 
     def _format_image_result(self, result):
         """Format image classification results with enhanced details"""
@@ -306,24 +379,25 @@ Ready for analysis! 🚀
         main_label = result.get("label", "Unknown")
         main_score = result.get("score", 0.0)
 
-        self.out.insert("end", f"🖼️  IMAGE CLASSIFICATION RESULTS\n\n")
-        self.out.insert("end", f"Primary Classification: {main_label.title()}\n")
-        self.out.insert("end", f"Confidence: {main_score:.1%}\n\n")
+        lines = [
+            "🖼️  IMAGE CLASSIFICATION RESULTS\n\n",
+            f"Primary Classification: {main_label.title()}\n",
+            f"Confidence: {main_score:.1%}\n\n",
+        ]
 
         # Description if available
         if "description" in result:
-            self.out.insert("end", f"📝 Description:\n{result['description']}\n\n")
+            lines.append(f"📝 Description:\n{result['description']}\n\n")
 
         # Top predictions if available
         if "top_predictions" in result:
-            self.out.insert("end", f"🏆 Top Predictions:\n")
+            lines.append("🏆 Top Predictions:\n")
             for i, pred in enumerate(result["top_predictions"], 1):
                 label = pred["label"].title()
                 score = pred["score"]
                 confidence_bar = "█" * int(score * 20)  # Visual confidence bar
-                self.out.insert(
-                    "end", f"  {i}. {label:<20} {score:>6.1%} {confidence_bar}\n"
-                )
+                lines.append(f"  {i}. {label:<20} {score:>6.1%} {confidence_bar}\n")
+        return "".join(lines)
 
     def _format_sentiment_result(self, result):
         """Format sentiment analysis results"""
@@ -335,10 +409,6 @@ Ready for analysis! 🚀
 
         emoji = emoji_map.get(label.upper(), "🤔")
 
-        self.out.insert("end", f"💭 SENTIMENT ANALYSIS RESULTS\n\n")
-        self.out.insert("end", f"Sentiment: {label} {emoji}\n")
-        self.out.insert("end", f"Confidence: {score:.1%}\n\n")
-
         # Add interpretation
         if score > 0.8:
             certainty = "Very confident"
@@ -347,29 +417,281 @@ Ready for analysis! 🚀
         else:
             certainty = "Somewhat uncertain"
 
-        self.out.insert(
-            "end", f"📊 Interpretation: {certainty} in this classification\n"
+        return (
+            "💭 SENTIMENT ANALYSIS RESULTS\n\n"
+            f"Sentiment: {label} {emoji}\n"
+            f"Confidence: {score:.1%}\n\n"
+            f"📊 Interpretation: {certainty} in this classification\n"
         )
 
+    def export_history(self):
+        """Save every retained result as JSONL"""
+        if not len(self.history):
+            messagebox.showinfo("Export", "There are no results to export yet.")
+            return
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            title="Export results",
+            defaultextension=".jsonl",
+            filetypes=[("JSON Lines", "*.jsonl"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            count = self.history.export_jsonl(path)
+        except OSError as e:
+            messagebox.showerror("Export failed", str(e))
+            return
+        self.result_count_label.configure(text=f"Exported {count} results", foreground="green")
+
     def clear(self):
         """Clear all results"""
-        self.out.configure(state="normal")
-        self.out.delete("1.0", "end")
+        self.history.clear()
+        self._selected_id = None
+        self._refresh_rows()
+        self._show_detail(self.WELCOME)
+        self.result_count_label.configure(text="No results yet", foreground="gray")
 
-        # Re-add welcome message
-        welcome_msg = """🤖 AI Model Analysis Results will appear here
 
-• Select a model and provide input in the 'Run' tab
-• Click 'Run Analysis' to process your input
-• Results will automatically appear here with timestamps
+class BatchFrame(ttk.Frame):
+    """
+    Batch mode: many sentences (typed, pasted or loaded from a file) or many
+    images (multi-select or a whole folder) run as one background job through
+    the batched inference path. A live progress bar, throughput/ETA readout
+    and a sortable table show results as each chunk finishes.
+    """
 
-Ready for analysis! 🚀
-"""
-        self.out.insert("1.0", welcome_msg)
-        self.out.configure(state="disabled")
+    COLUMNS = (
+        ("index", "#", 50, "e"),
+        ("input", "Input", 320, "w"),
+        ("label", "Label", 160, "w"),
+        ("score", "Score", 70, "e"),
+        ("latency", "Latency (ms)", 100, "e"),
+    )
 
-        self.result_count = 0
-        self.result_count_label.configure(text="No results yet", foreground="gray")
+    def __init__(self, master, controller, **kwargs):
+        super().__init__(master, **kwargs)
+        self.controller = controller
+        self.model_var = tk.StringVar(value="Sentiment")  # independent of the Run tab
+        self.chunk_var = tk.IntVar(value=16)
+        self.images = []
+        self._job = None
+        self._started = 0.0
+        self._rows = {}  # tree item id -> sort values
+        self._sort = ("index", False)
+
+        # Model + chunk size
+        top = ttk.Frame(self)
+        top.pack(fill="x", padx=4, pady=(4, 0))
+        ttk.Label(top, text="Model:").pack(side="left")
+        combo = ttk.Combobox(
+            top, textvariable=self.model_var, values=["Sentiment", "Image"],
+            state="readonly", width=12,
+        )
+        combo.pack(side="left", padx=4)
+        combo.bind("<<ComboboxSelected>>", self._on_model_change)
+        ttk.Label(top, text="Items per step:").pack(side="left", padx=(12, 0))
+        ttk.Spinbox(top, from_=1, to=256, textvariable=self.chunk_var, width=5).pack(
+            side="left", padx=4
+        )
+
+        # Sentence input
+        self.text_frame = ttk.LabelFrame(self, text="Sentences (one per line)", padding=6)
+        self.text_entry = scrolledtext.ScrolledText(self.text_frame, height=6)
+        self.text_entry.pack(fill="both", expand=True)
+        ttk.Button(
+            self.text_frame, text="📂 Load file (.txt / .csv / .jsonl)", command=self._load_texts
+        ).pack(anchor="w", pady=(4, 0))
+
+        # Image input
+        self.image_frame = ttk.LabelFrame(self, text="Images", padding=6)
+        img_btns = ttk.Frame(self.image_frame)
+        img_btns.pack(fill="x")
+        ttk.Button(img_btns, text="🖼️ Add images…", command=self._add_images).pack(side="left")
+        ttk.Button(img_btns, text="📁 Add folder…", command=self._add_folder).pack(
+            side="left", padx=4
+        )
+        ttk.Button(img_btns, text="Clear list", command=self._clear_images).pack(side="left")
+        self.images_label = ttk.Label(self.image_frame, text="No images selected", foreground="gray")
+        self.images_label.pack(anchor="w", pady=(4, 0))
+
+        # Run / cancel / progress
+        run_row = ttk.Frame(self)
+        run_row.pack(fill="x", padx=4, pady=6, side="top")
+        self.run_btn = ttk.Button(
+            run_row, text="▶ Run Batch", command=self._run, style="Accent.TButton"
+        )
+        self.run_btn.pack(side="left")
+        self.cancel_btn = ttk.Button(
+            run_row, text="⏹ Cancel", command=self._cancel, state="disabled"
+        )
+        self.cancel_btn.pack(side="left", padx=4)
+        self.progress = ttk.Progressbar(run_row, mode="determinate")
+        self.progress.pack(side="left", fill="x", expand=True, padx=8)
+        self.rate_label = ttk.Label(run_row, text="", width=36)
+        self.rate_label.pack(side="left")
+
+        # Results table, click a heading to sort
+        table = ttk.Frame(self)
+        table.pack(fill="both", expand=True, padx=4, pady=(0, 4))
+        self.tree = ttk.Treeview(
+            table, columns=[c[0] for c in self.COLUMNS], show="headings", height=12
+        )
+        for key, title, width, anchor in self.COLUMNS:
+            self.tree.heading(key, text=title, command=lambda k=key: self._sort_by(k))
+            self.tree.column(key, width=width, anchor=anchor, stretch=(key == "input"))
+        scroll = ttk.Scrollbar(table, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scroll.set)
+        scroll.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self._on_model_change()
+
+    # ---- inputs ----------------------------------------------------------
+
+    def _on_model_change(self, *_):
+        if self.model_var.get() == "Image":
+            self.text_frame.pack_forget()
+            self.image_frame.pack(fill="x", padx=4, pady=4, after=self.winfo_children()[0])
+        else:
+            self.image_frame.pack_forget()
+            self.text_frame.pack(fill="both", padx=4, pady=4, after=self.winfo_children()[0])
+
+    def _load_texts(self):
+        path = filedialog.askopenfilename(
+            parent=self,
+            title="Load sentences",
+            filetypes=[("Text, CSV or JSONL", "*.txt *.csv *.jsonl"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            texts = self.controller.texts_in_file(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Load failed", str(e))
+            return
+        self.text_entry.delete("1.0", "end")
+        self.text_entry.insert("1.0", "\n".join(t.replace("\n", " ") for t in texts))
+
+    def _add_images(self):
+        self._set_images(self.images + self.controller.pick_files(self))
+
+    def _add_folder(self):
+        folder = filedialog.askdirectory(parent=self, title="Choose a folder of images")
+        if folder:
+            self._set_images(self.images + self.controller.images_in_folder(folder))
+
+    def _clear_images(self):
+        self._set_images([])
+
+    def _set_images(self, paths):
+        self.images = list(dict.fromkeys(paths))  # drop duplicates, keep order
+        n = len(self.images)
+        self.images_label.configure(
+            text=f"{n} image{'s' if n != 1 else ''} selected" if n else "No images selected",
+            foreground="green" if n else "gray",
+        )
+
+    def _items(self):
+        if self.model_var.get() == "Image":
+            return list(self.images)
+        lines = self.text_entry.get("1.0", "end").splitlines()
+        return [line.strip() for line in lines if line.strip()]
+
+    # ---- running ---------------------------------------------------------
+
+    def _run(self):
+        items = self._items()
+        if not items:
+            messagebox.showwarning("No Input", "Add some sentences or images first!")
+            return
+        try:
+            chunk = max(1, int(self.chunk_var.get()))
+        except (tk.TclError, ValueError):
+            chunk = 16
+        self.tree.delete(*self.tree.get_children())
+        self._rows.clear()
+        self.progress.configure(maximum=len(items), value=0)
+        self.rate_label.configure(text=f"Queued {len(items)} items")
+        self.run_btn.configure(state="disabled")
+        self.cancel_btn.configure(state="normal")
+        self._job = self.controller.submit_batch(self.model_var.get(), items, chunk)
+
+    def _cancel(self):
+        if self._job is not None:
+            self._job.cancel()
+            self.rate_label.configure(text="Cancelling…")
+
+    def on_job_event(self, kind, job, data):
+        """Worker event pumped from the Tk loop (see main.poll_worker)"""
+        if job is not self._job:
+            return
+        if kind == "started":
+            self._started = time.perf_counter()
+            self.rate_label.configure(text="Loading model…")
+        elif kind == "progress":
+            done, total, rows = data
+            self._add_rows(rows, job.meta.get("model"))
+            self.progress.configure(value=done)
+            elapsed = max(time.perf_counter() - self._started, 1e-9)
+            rate = done / elapsed
+            eta = (total - done) / rate if rate else 0
+            self.rate_label.configure(
+                text=f"{done}/{total} · {rate:.1f} items/s · ETA {eta:.0f}s"
+            )
+        elif kind in ("done", "error", "cancelled"):
+            elapsed = time.perf_counter() - self._started if self._started else 0.0
+            done = len(self._rows)
+            if kind == "done":
+                text = f"✅ {done} items in {elapsed:.1f}s ({done / max(elapsed, 1e-9):.1f} items/s)"
+            elif kind == "error":
+                text = f"❌ Failed: {data}"
+            else:
+                text = f"Cancelled after {done} items"
+            self.rate_label.configure(text=text)
+            self.run_btn.configure(state="normal")
+            self.cancel_btn.configure(state="disabled")
+            self._job = None
+            self._started = 0.0
+
+    def _add_rows(self, rows, model_name):
+        for index, item, out, latency, error in rows:
+            source = item if isinstance(item, str) else getattr(item, "filename", "<image>")
+            if error:
+                label, score = f"error: {error}", None
+            else:
+                label, score = out.get("label", "?"), float(out.get("score", 0.0))
+            values = (
+                index + 1,
+                source.split("/")[-1] if model_name == "Image" else source[:200],
+                label,
+                f"{score:.3f}" if score is not None else "",
+                f"{latency * 1000:.1f}",
+            )
+            iid = self.tree.insert("", "end", values=values)
+            self._rows[iid] = {
+                "index": index + 1,
+                "input": values[1].lower(),
+                "label": label.lower(),
+                "score": score if score is not None else -1.0,
+                "latency": latency,
+            }
+        if self._sort != ("index", False):
+            self._apply_sort()
+
+    def _sort_by(self, key):
+        column, descending = self._sort
+        self._sort = (key, not descending if key == column else key in ("score", "latency"))
+        self._apply_sort()
+
+    def _apply_sort(self):
+        key, descending = self._sort
+        ordered = sorted(self._rows, key=lambda iid: self._rows[iid][key], reverse=descending)
+        for position, iid in enumerate(ordered):
+            self.tree.move(iid, "", position)
+        for col, title, _, _ in self.COLUMNS:
+            arrow = (" ▼" if descending else " ▲") if col == key else ""
+            self.tree.heading(col, text=title + arrow)
 
 
 class InfoFrame(ttk.Frame):
@@ -403,8 +725,8 @@ class InfoFrame(ttk.Frame):
             content += f"🔹 {k}:\n   {v}\n\n"
 
         content += "\n" + "=" * 50 + "\n"
-        content += "💡 These models are loaded lazily for optimal performance!\n"
-        content += "🚀 First inference may take longer due to model loading."
+        content += "💡 Models are loaded and warmed up in the background at startup.\n"
+        content += "🚀 The status bar shows when each model is ready (set APP_WARM_TASKS to choose which)."
 
         self.text.insert("end", content)
         self.text.configure(state="disabled")
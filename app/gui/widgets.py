@@ -0,0 +1,96 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualList(ttk.Frame):
+    """
+    Read-only list that only renders the rows currently on screen.
+
+    The widget never holds more lines than fit in its height: row_count()
+    and row_text(i) are asked for the visible window on every scroll, resize
+    or refresh, and that window is drawn with a single insert. Clicking a row
+    calls on_select(index).
+    """
+
+    def __init__(self, master, row_count, row_text, on_select=None, height: int = 10, **kwargs):
+        super().__init__(master, **kwargs)
+        self._row_count = row_count
+        self._row_text = row_text
+        self._on_select = on_select
+        self._first = 0          # index of the top visible row
+        self.selected = None     # index of the highlighted row
+
+        self.text = tk.Text(
+            self, height=height, wrap="none", cursor="arrow",
+            font=("Consolas", 10), relief="sunken", borderwidth=2,
+        )
+        self.text.tag_configure("selected", background="#cce4f7")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.text.pack(side="left", expand=True, fill="both")
+        self.text.configure(state="disabled")
+
+        self.text.bind("<Configure>", lambda e: self.refresh())
+        self.text.bind("<Button-1>", self._on_click)
+        self.text.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1) or "break")
+        self.text.bind("<Button-4>", lambda e: self.scroll(-1) or "break")  # X11 wheel up
+        self.text.bind("<Button-5>", lambda e: self.scroll(1) or "break")   # X11 wheel down
+
+    def visible_rows(self) -> int:
+        line = self.text.tk.call("font", "metrics", self.text.cget("font"), "-linespace")
+        height = self.text.winfo_height()
+        if height <= 1:  # not mapped yet
+            return int(self.text.cget("height"))
+        return max(1, height // int(line))
+
+    @property
+    def at_bottom(self) -> bool:
+        return self._first + self.visible_rows() >= self._row_count()
+
+    def scroll(self, rows: int) -> None:
+        self._first += rows
+        self.refresh()
+
+    def select(self, index) -> None:
+        self.selected = index
+        self.refresh()
+
+    def refresh(self, follow: bool = False) -> None:
+        """Redraw the visible window; follow=True jumps to the last row."""
+        total = self._row_count()
+        visible = self.visible_rows()
+        if follow:
+            self._first = total - visible
+        self._first = max(0, min(self._first, total - visible))
+        stop = min(total, self._first + visible)
+
+        lines = [self._row_text(i) for i in range(self._first, stop)]
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", "\n".join(lines))
+        if self.selected is not None and self._first <= self.selected < stop:
+            row = self.selected - self._first + 1
+            self.text.tag_add("selected", f"{row}.0", f"{row}.end+1c")
+        self.text.configure(state="disabled")
+
+        if total:
+            self.scrollbar.set(self._first / total, stop / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._first = int(float(amount) * self._row_count())
+            self.refresh()
+        elif action == "scroll":
+            step = self.visible_rows() if unit == "pages" else 1
+            self.scroll(int(amount) * step)
+
+    def _on_click(self, event):
+        row = int(self.text.index(f"@{event.x},{event.y}").split(".")[0]) - 1
+        index = self._first + row
+        if index < self._row_count():
+            self.select(index)
+            if self._on_select:
+                self._on_select(index)
+        return "break"
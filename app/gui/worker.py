@@ -0,0 +1,124 @@
+"""
+Background inference worker for the GUI.
+
+Tk widgets may only be touched from the main thread, so the GUI puts jobs on a
+queue, one persistent worker thread runs them in order, and the Tk main loop
+drains the worker's event queue with after() polling.
+
+Events are (kind, job, data) tuples:
+    queued / started / cancelled   data is None
+    progress                       data is (done, total, partial) - partial is
+                                   whatever the job passed along, e.g. new rows
+    done                           data is the job's return value
+    error                          data is the error message
+"""
+import itertools
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class Cancelled(Exception):
+    """Raised by Job.check() once the job has been cancelled."""
+
+
+class Job:
+    """One unit of work; fn(job) may call job.progress() and job.check()."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, fn: Callable[["Job"], Any], events: queue.Queue, label: str = "", **meta):
+        self.id = next(Job._ids)
+        self.fn = fn
+        self.label = label
+        self.meta = meta
+        self.state = "queued"  # queued -> running -> done | error | cancelled
+        self._events = events
+        self._cancel = threading.Event()
+
+    def cancel(self) -> None:
+        # Queued jobs are skipped; a running job stops at its next check()
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check(self) -> None:
+        if self._cancel.is_set():
+            raise Cancelled()
+
+    def progress(self, done: int, total: int, partial: Any = None) -> None:
+        self._events.put(("progress", self, (done, total, partial)))
+        self.check()
+
+
+class InferenceWorker:
+    """A single persistent thread that runs submitted jobs first in, first out."""
+
+    def __init__(self):
+        self.events: queue.Queue = queue.Queue()
+        self._jobs: queue.Queue = queue.Queue()
+        self._active: Dict[int, Job] = {}  # queued or running, in submit order
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._loop, name="gui-infer", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable[[Job], Any], label: str = "", **meta) -> Job:
+        job = Job(fn, self.events, label, **meta)
+        with self._lock:
+            self._active[job.id] = job
+        self.events.put(("queued", job, None))
+        self._jobs.put(job)
+        return job
+
+    def cancel_all(self) -> int:
+        """Cancel every queued job and the running one; returns how many."""
+        with self._lock:
+            jobs = list(self._active.values())
+        for job in jobs:
+            job.cancel()
+        return len(jobs)
+
+    def pending(self) -> List[Job]:
+        with self._lock:
+            return list(self._active.values())
+
+    def poll(self) -> List[Tuple[str, Job, Any]]:
+        """Everything that happened since the last poll (never blocks)."""
+        out = []
+        while True:
+            try:
+                out.append(self.events.get_nowait())
+            except queue.Empty:
+                return out
+
+    def close(self) -> None:
+        self.cancel_all()
+        self._jobs.put(None)
+
+    def _loop(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            if job.cancelled:
+                self._finish(job, "cancelled", None)
+                continue
+            job.state = "running"
+            self.events.put(("started", job, None))
+            try:
+                result = job.fn(job)
+            except Cancelled:
+                self._finish(job, "cancelled", None)
+            except Exception as e:
+                self._finish(job, "error", str(e))
+            else:
+                # A job cancelled mid-run that couldn't stop early is discarded
+                self._finish(job, "cancelled" if job.cancelled else "done", result)
+
+    def _finish(self, job: Job, state: str, data) -> None:
+        job.state = state
+        with self._lock:
+            self._active.pop(job.id, None)
+        self.events.put((state, job, None if state == "cancelled" else data))
@@ -0,0 +1,21 @@
+# Lazy exports: `from app.models import SentimentModel` only imports the module
+# (and its heavy dependencies) when the name is first used.
+import importlib
+
+_LAZY = {
+    "SentimentModel": "app.models.sentiment_model",
+    "ImageClassifier": "app.models.image_classifier",
+    "ModelRegistry": "app.models.registry",
+    # No "registry" here: that name is also the submodule, so the result would
+    # depend on import order. Use `from app.models.registry import registry`.
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value  # cache so __getattr__ isn't hit again
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,34 +1,302 @@
+import logging
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
 from abc import ABC, abstractmethod  
 from typing import Any, Dict          
+from app.utils.concurrency import get_executor
+from app.utils.cache import MISS, LRUCache, get_namespace
+from app.utils.disk_cache import get_disk_cache
+from app.utils.log import get_logger, log_event
+from app.utils.metrics import metrics
+from .backends import BACKENDS, OnnxBackend, build_pipeline
+
+_cache_bypass = threading.local()  # set by cache_disabled() on the current thread only
+
+# A broken disk tier (locked or corrupt file, full disk, a result json can't
+# encode) must never fail inference; these degrade to a miss / skipped write
+_DISK_ERRORS = (sqlite3.Error, TypeError, ValueError)
+
+
+@contextmanager
+def cache_disabled():
+    # Every lookup misses and nothing is stored on this thread, e.g. for warm-up
+    # runs that must reach the model even when a disk cache already has the answer
+    _cache_bypass.on = True
+    try:
+        yield
+    finally:
+        _cache_bypass.on = False
+
+
+def cache_bypassed() -> bool:
+    # Work handed to other threads must carry this along: they don't see the flag
+    return getattr(_cache_bypass, "on", False)
+
 class LoggingMixin:
 
-    #  simple helper to log message to the console
-    def log(self, event: str, detail: Dict[str, Any] | None = None) -> None:
-        print(f"[LOG] {event} :: {detail or {}}")
+    #  Structured events through app.utils.log: the caller only enqueues a record,
+    #  a background thread writes JSON lines to stderr (stdout stays clean for results).
+    #  Per-request events pass sampled=True and are kept at APP_LOG_SAMPLE rate.
+    def log(self, event: str, detail: Dict[str, Any] | None = None, sampled: bool = False) -> None:
+        logger = self.__dict__.get("_logger")
+        if logger is None:
+            logger = self._logger = get_logger(type(self).__module__)
+        log_event(logger, event, detail, sampled)
 
 class CachingMixin:
-    # Keeps result in the  memory so  that repeated calls are faster
-    _cache: dict = {}  
+    # Keeps result in the  memory so  that repeated calls are faster.
+    # Each model gets its own bounded LRU namespace; subclasses can tune the limits.
+    # When a disk tier is configured (app.utils.disk_cache) it sits behind the
+    # memory tier and is shared across processes and restarts.
+    cache_max_entries: int = 4096
+    cache_max_bytes: int | None = 64 * 1024 * 1024
+    cache_ttl: float | None = None    # seconds, None = never expire
+
+    def cache_namespace(self) -> str:
+        # Quantized weights / other backends give slightly different scores,
+        # so each variant gets its own namespace
+        if hasattr(self, "variant_name"):
+            return self.variant_name()
+        return type(self).__name__
+
+    @property
+    def _cache(self) -> LRUCache:
+        return get_namespace(
+            self.cache_namespace(),
+            max_entries=self.cache_max_entries,
+            max_bytes=self.cache_max_bytes,
+            ttl=self.cache_ttl,
+        )
+
+    def _disk_namespace(self) -> str:
+        # Results are only valid for the exact weights that produced them
+        revision = self.model_revision() if hasattr(self, "model_revision") else ""
+        return f"{self.cache_namespace()}@{revision}"
 
-    def get_cache(self, key):
-        return self._cache.get(key)   # Return cached value if it is exist
+    def get_cache(self, key, default=None):
+        if cache_bypassed():
+            return default
+        value = self._cache.get(key, MISS)   # Return cached value if it is exist
+        if value is not MISS:
+            return value
+        disk = get_disk_cache()
+        if disk is not None:
+            try:
+                value = disk.get(self._disk_namespace(), key)
+            except _DISK_ERRORS as e:
+                _disk_error("disk_cache_get_failed", e)
+                return default
+            if value is not None:
+                self._cache.set(key, value)  # promote to the memory tier
+                return value
+        return default
 
     def set_cache(self, key, value):
-        self._cache[key] = value      # Storing new values in the cache
+        if cache_bypassed():
+            return
+        self._cache.set(key, value)      # Storing new values in the cache
+        disk = get_disk_cache()
+        if disk is not None:
+            try:
+                disk.set(self._disk_namespace(), key, value)
+            except _DISK_ERRORS as e:
+                _disk_error("disk_cache_set_failed", e)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        stats = self._cache.stats()
+        disk = get_disk_cache()
+        if disk is not None:
+            stats["disk"] = disk.stats()
+        return stats
+
+
+def _disk_error(event: str, error: Exception) -> None:
+    log_event(
+        get_logger("cache"), event,
+        {"error": f"{type(error).__name__}: {error}"},
+        sampled=True, level=logging.WARNING,
+    )
+
+class AsyncMixin:
+    # asyncio facade: `await model.ainfer(x)` / `await model.ainfer_batch(xs)`.
+    # The blocking calls run on the shared inference executor. At most
+    # async_max_pending calls per model (per event loop) are queued or running;
+    # further callers wait for a slot, which is the backpressure. `timeout` covers
+    # both the wait and the run. On timeout/cancellation a call that hasn't
+    # started is dropped; a forward pass already running finishes and is discarded.
+    async_max_pending: int = 64
+    async_chunk: int = 128            # ainfer_batch stops between chunks of this many items
+
+    async def ainfer(self, data, timeout: float | None = None):
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        return await self._aio_call(loop, deadline, self.infer, data)
+
+    async def ainfer_batch(self, items, batch_size: int | None = None, timeout: float | None = None):
+        import asyncio
+
+        if not isinstance(items, (list, tuple)):
+            raise TypeError(f"Expected {(list, tuple)}, got {type(items)}")
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        out = []
+        for start in range(0, len(items), self.async_chunk):
+            chunk = list(items[start:start + self.async_chunk])
+            out.extend(await self._aio_call(loop, deadline, self.infer_batch, chunk, batch_size))
+        return out
+
+    async def _aio_call(self, loop, deadline, fn, *args):
+        import asyncio
+
+        def remaining():
+            return None if deadline is None else max(0.0, deadline - loop.time())
+
+        slots = self._aio_slots(loop)
+        await asyncio.wait_for(slots.acquire(), remaining())
+        try:
+            job = get_executor().submit(fn, *args)
+        except BaseException:
+            slots.release()
+            raise
+        # The slot is held until the job is really finished (or dropped unstarted)
+        job.add_done_callback(lambda _: _release_threadsafe(loop, slots))
+        # Cancelling the wrapped future cancels the job if it hasn't started yet
+        return await asyncio.wait_for(asyncio.wrap_future(job, loop=loop), remaining())
+
+    def _aio_slots(self, loop):
+        import asyncio
+
+        by_loop = self.__dict__.get("_aio_slots_by_loop")
+        if by_loop is None:
+            by_loop = self._aio_slots_by_loop = weakref.WeakKeyDictionary()
+        slots = by_loop.get(loop)
+        if slots is None:
+            slots = by_loop[loop] = asyncio.Semaphore(self.async_max_pending)
+        return slots
+
+
+def _release_threadsafe(loop, slots) -> None:
+    try:
+        loop.call_soon_threadsafe(slots.release)
+    except RuntimeError:              # loop already closed
+        pass
+
 
 class HFModelBase(ABC):
-    def __init__(self, model_id: str):
+    def __init__(
+        self, model_id: str, device=None, torch_dtype=None, quantize: bool = False,
+        backend: str = "torch", onnx_dir: str | None = None,
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+        if quantize and backend != "torch":
+            raise ValueError("quantize is only supported with the torch backend")
         self._model_id = model_id     # Save model id 
+        self._device = device         # e.g. "cpu", "cuda:0" or None for HF default
+        self._torch_dtype = torch_dtype
+        self._quantize = quantize     # dynamic INT8 for Linear layers (CPU only)
+        self._backend = backend       # "torch" (HF pipeline) or "onnx" (ONNX Runtime)
+        self._onnx_dir = onnx_dir     # export directory, defaults per model_id
         self.__pipe = None            #  variable to store  HF pipeline
+        # HF pipelines (and fast tokenizers) aren't safe to call from several
+        # threads at once; one forward pass per model at a time
+        self._infer_lock = threading.Lock()
+
+    @property
+    def model_id(self) -> str:
+        return self._model_id
+
+    def _pipeline_kwargs(self) -> Dict[str, Any]:
+        # Only forward the options that were actually set so HF keeps its defaults
+        kwargs: Dict[str, Any] = {"model": self._model_id}
+        if self._device is not None:
+            kwargs["device"] = self._device
+        if self._torch_dtype is not None:
+            kwargs["torch_dtype"] = self._torch_dtype
+        return kwargs
+
+    @property
+    def quantized(self) -> bool:
+        return self._quantize
+
+    @property
+    def backend(self) -> str:
+        return self._backend
+
+    def variant_name(self) -> str:
+        # e.g. "SentimentModel:<model_id>:int8" - names caches and metrics
+        suffix = ":int8" if self._quantize else ""
+        if self._backend != "torch":
+            suffix += f":{self._backend}"
+        return f"{type(self).__name__}:{self._model_id}{suffix}"
+
+    def _span(self, stage: str):
+        # Times one stage (cache_lookup, preprocess, forward, postprocess)
+        # into this model's latency histograms
+        return metrics.span(self.variant_name(), stage)
+
+    def _build_backend(self, hf_task: str):
+        # Both backends are callables with the pipeline's call/return contract
+        if self._backend == "onnx":
+            return OnnxBackend(hf_task, self._model_id, self._onnx_dir)
+        return build_pipeline(hf_task, **self._pipeline_kwargs())
 
     def _set_pipeline(self, pipe) -> None:
+        if self._quantize:
+            pipe.model = self._quantize_dynamic(pipe.model)
         self.__pipe = pipe            #  To assign the pipeline once during init
 
+    @staticmethod
+    def _quantize_dynamic(model):
+        # Weights of nn.Linear stored as int8, activations quantized on the fly.
+        # Only the CPU backend supports these kernels.
+        import torch
+
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
     def _pipe(self):
         if self.__pipe is None:     
             raise RuntimeError("Pipeline not initialized")
         return self.__pipe            # Return the hidden pipeline
 
+    def _run_pipe(self, *args, **kwargs):
+        # Every forward pass goes through here so concurrent callers are serialised
+        with self._infer_lock:
+            return self._pipe()(*args, **kwargs)
+
+    def model_revision(self) -> str:
+        # Hub commit of the loaded weights, falling back to the model id
+        config = getattr(getattr(self.__pipe, "model", None), "config", None)
+        return getattr(config, "_commit_hash", None) or "unversioned"
+
+    def memory_bytes(self) -> int:
+        # Size of the weights held by the pipeline. Dynamically quantized
+        # Linear layers keep theirs in _packed_params, neither a parameter nor
+        # a buffer, but state_dict() unpacks them: count tensors from all three
+        # once each (state_dict entries share storage with the live tensors)
+        model = getattr(self.__pipe, "model", None)
+        if model is None or not hasattr(model, "parameters"):
+            return 0
+        tensors = list(model.parameters()) + list(model.buffers())
+        stack = list(model.state_dict().values()) if hasattr(model, "state_dict") else []
+        while stack:
+            value = stack.pop()
+            if isinstance(value, (tuple, list)):
+                stack.extend(value)  # packed params unpack to (weight, bias)
+            elif hasattr(value, "element_size"):
+                tensors.append(value)
+        seen, total = set(), 0
+        for t in tensors:
+            if (t.data_ptr(), t.numel()) in seen:
+                continue
+            seen.add((t.data_ptr(), t.numel()))
+            total += t.numel() * t.element_size()
+        return total
+
     @abstractmethod
     def infer(self, data: Any) -> Dict[str, Any]:
         # All subclasses must implement this method to run predictions
@@ -0,0 +1,115 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-item requests into one infer_batch() call.
+
+    A worker thread takes the first waiting request, then keeps collecting
+    until either `max_batch_size` items are gathered or `max_wait_ms` has
+    passed since that first item, runs one batched forward pass and resolves
+    each caller's Future with its own result.
+    """
+
+    def __init__(self, model, max_batch_size: int = 32, max_wait_ms: float = 5.0, max_queue: int = 1024):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        # Stats
+        self._batch_sizes: Dict[int, int] = {}   # power-of-two bucket -> count
+        self._batches = 0
+        self._items = 0
+        self._max_depth = 0
+        self._wait_total = 0.0
+        self._worker = threading.Thread(target=self._loop, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, item) -> Future:
+        """Queue one input; raises queue.Full if the queue is at capacity."""
+        fut: Future = Future()
+        self._queue.put_nowait((item, fut, time.perf_counter()))
+        depth = self._queue.qsize()
+        with self._lock:
+            self._max_depth = max(self._max_depth, depth)
+        return fut
+
+    def infer(self, item, timeout: float | None = None):
+        return self.submit(item).result(timeout)
+
+    def close(self) -> None:
+        self._queue.put(_STOP)
+        self._worker.join()
+
+    def _loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            deadline = time.perf_counter() + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    nxt = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stop = True
+                    break
+                batch.append(nxt)
+            self._run(batch)
+            if stop:
+                return
+
+    def _run(self, batch) -> None:
+        # Skip callers that already gave up (Future cancelled)
+        batch = [b for b in batch if b[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        started = time.perf_counter()
+        try:
+            results = self.model.infer_batch([item for item, _, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+            else:
+                # One bad input shouldn't fail everything coalesced with it:
+                # rerun item by item so each caller gets its own outcome
+                for item, fut, _ in batch:
+                    try:
+                        fut.set_result(self.model.infer(item))
+                    except Exception as item_error:
+                        fut.set_exception(item_error)
+        else:
+            for (_, fut, _), res in zip(batch, results):
+                fut.set_result(res)
+        with self._lock:
+            bucket = 1 << (len(batch) - 1).bit_length()
+            self._batch_sizes[bucket] = self._batch_sizes.get(bucket, 0) + 1
+            self._batches += 1
+            self._items += len(batch)
+            self._wait_total += sum(started - t for _, _, t in batch)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_depth,
+                "batches": self._batches,
+                "items": self._items,
+                "mean_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+                "mean_queue_wait_ms": round(self._wait_total / self._items * 1000, 3) if self._items else 0.0,
+                # keys are upper bounds: {"1": n, "2": n, "4": n, ...}
+                "batch_size_histogram": {str(k): v for k, v in sorted(self._batch_sizes.items())},
+            }
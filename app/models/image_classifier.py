@@ -1,34 +1,211 @@
-from transformers import pipeline  # Importing the  Hugging Face pipeline
+import io
+import itertools
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image  # it is used for  opening images
-from .base import HFModelBase, LoggingMixin, CachingMixin
+from .base import AsyncMixin, HFModelBase, LoggingMixin, CachingMixin, cache_bypassed
+from app.utils.cache import MISS, get_namespace
 from app.utils.decorators import timed, validate_input
+from app.utils.hashing import bytes_digest, file_digest, image_digest
 
+# A file path, the encoded bytes of an image file (e.g. an upload) or a PIL image
+_INPUT_TYPES = (str, bytes, Image.Image)
 
-class ImageClassifier(LoggingMixin, CachingMixin, HFModelBase):
 
-    def __init__(self, model_id: str = "apple/mobilevit-x-small"):
-        super().__init__(model_id)  # Call base class constructor
-        # Creating  the Hugging Face pipeline for image classifications
-        self._set_pipeline(pipeline("image-classification", model=model_id))
+class ImageClassifier(LoggingMixin, CachingMixin, AsyncMixin, HFModelBase):
+
+    TASK = "image"
+    HF_TASK = "image-classification"
+    DEFAULT_MODEL_ID = "apple/mobilevit-x-small"
+    batch_size = 8       # images per forward pass in infer_batch
+    decode_workers = 4   # threads decoding images ahead of the model
+    prefetch = 2         # decoded batches allowed to wait for the model
+    fast_decode = True   # JPEG draft() decoding + one resize straight to model resolution
+    preprocessed_cache_entries = 0  # > 0 keeps that many model-resolution images by content hash
+
+    def __init__(
+        self, model_id: str = DEFAULT_MODEL_ID, device=None, torch_dtype=None, quantize: bool = False,
+        backend: str = "torch", onnx_dir: str | None = None,
+    ):
+        super().__init__(model_id, device, torch_dtype, quantize, backend, onnx_dir)  # Call base class constructor
+        # Creating  the Hugging Face pipeline for image classifications (or the ONNX Runtime backend)
+        self._set_pipeline(self._build_backend(self.HF_TASK))
+        self._geometry = self._input_geometry()  # what the image processor resizes to
+        self._decode_pool = None                 # (pid, ThreadPoolExecutor), see _decoder()
+        self._decode_lock = threading.Lock()
 
     @timed  # Added elapsed time
-    @validate_input((str, Image.Image))
+    @validate_input(_INPUT_TYPES)
     def infer(self, data):
         path = (
-            data if isinstance(data, str) else getattr(data, "filename", "<PIL Image>")
+            data if isinstance(data, str)
+            else "<bytes>" if isinstance(data, bytes)
+            else getattr(data, "filename", "<PIL Image>")
         )
-        self.log("image_infer_start", {"path": path})  # Log the attempt
-        key = ("img", path)  # Created the  cache key using image path
-
-        cached = self.get_cache(key)
-        if cached:  # If already cached then return it
+        self.log("image_infer_start", {"path": path}, sampled=True)  # Log the attempt
+        with self._span("cache_lookup"):
+            key = self._cache_key(data)  # Content hash, not the (reusable) file name
+            cached = self.get_cache(key)
+        if cached is not None:  # If already cached then return it
             return cached
 
-        img = (
-            Image.open(data) if isinstance(data, str) else data
-        )  # Open the image when the path is given
-        results = self._pipe()(img)  # Get all results from pipeline
+        img = self._prepare_timed(data, key)  # Open + decode the image when the path is given
+        with self._span("forward"):
+            results = self._run_pipe(img)  # Get all results from pipeline
+        with self._span("postprocess"):
+            out = self._format(results)
+        self.set_cache(key, out)  # Cache result
+        return out
+
+    @timed
+    @validate_input((list, tuple))
+    def infer_batch(self, items, batch_size: int | None = None):
+        """
+        Classify many images (paths, encoded bytes or PIL images).
+        Hashing and decoding run on the model's decode pool, which keeps
+        `prefetch` batches ahead of the forward pass, so the model never waits
+        on disk/JPEG work and only a few decoded batches are held in memory. Results are returned in
+        input order; stage timings go to app.utils.metrics.
+        """
+        batch_size = batch_size or self.batch_size
+        self.log("image_batch_start", {"count": len(items), "batch_size": batch_size})
+        for i, item in enumerate(items):
+            if not isinstance(item, _INPUT_TYPES):
+                raise TypeError(f"Expected {_INPUT_TYPES}, got {type(item)} at index {i}")
+        pool = self._decoder()
+        results = [None] * len(items)
+        pending = {}  # cache key -> (item, indexes)
+
+        # Content hashing reads whole files, so it runs on the decode workers too
+        lookups = pool.map(self._lookup, items, itertools.repeat(cache_bypassed()))
+        for i, (key, cached) in enumerate(lookups):
+            if key in pending:
+                pending[key][1].append(i)
+            elif cached is not None:
+                results[i] = cached
+            else:
+                pending[key] = (items[i], [i])
+
+        keys = list(pending)
+        chunks = (keys[s:s + batch_size] for s in range(0, len(keys), batch_size))
+
+        def decode(chunk):
+            return chunk, [pool.submit(self._prepare_timed, pending[k][0], k) for k in chunk]
+
+        # Keep `prefetch` batches decoding while the model runs the current one
+        inflight = deque(decode(c) for c in itertools.islice(chunks, max(1, self.prefetch)))
+        try:
+            while inflight:
+                chunk, futures = inflight.popleft()
+                nxt = next(chunks, None)
+                if nxt is not None:
+                    inflight.append(decode(nxt))
+                images = [f.result() for f in futures]
+                with self._span("forward"):
+                    outs = self._run_pipe(images, batch_size=len(images))
+                for key, res in zip(chunk, outs):
+                    with self._span("postprocess"):
+                        out = self._format(res)
+                    self.set_cache(key, out)
+                    for i in pending[key][1]:
+                        results[i] = out
+        finally:
+            # Bailing out early: drop decodes that haven't started yet
+            for _, futures in inflight:
+                for f in futures:
+                    f.cancel()
+        return results
+
+    def _decoder(self) -> ThreadPoolExecutor:
+        # One decode pool per model, reused by every infer_batch call. A forked
+        # replica inherits the object but not its threads, so it builds its own.
+        with self._decode_lock:
+            if self._decode_pool is None or self._decode_pool[0] != os.getpid():
+                pool = ThreadPoolExecutor(self.decode_workers, thread_name_prefix="image-decode")
+                self._decode_pool = (os.getpid(), pool)
+            return self._decode_pool[1]
+
+    def _lookup(self, item, bypass: bool = False):
+        # Runs on a decode worker, which doesn't see the caller's cache_disabled()
+        with self._span("cache_lookup"):
+            key = self._cache_key(item)  # Content hash, not the (reusable) file name
+            return key, None if bypass else self.get_cache(key)
 
+    def _prepare_timed(self, item, key=None):
+        with self._span("preprocess"):
+            return self._prepare(item, key)
+
+    def _prepare(self, item, key=None):
+        # Runs on a decode worker: open, decode and bring the image to model
+        # resolution off the model thread. The pipeline's own resize then has
+        # nothing left to do.
+        cache = self._preprocessed_cache() if key is not None else None
+        if cache is not None:
+            img = cache.get(key, MISS)
+            if img is not MISS:
+                return img
+
+        opened = isinstance(item, (str, bytes))
+        if opened:
+            img = Image.open(io.BytesIO(item) if isinstance(item, bytes) else item)
+        else:
+            img = item
+        target = self._target_size(img.size) if self.fast_decode else None
+        if opened and target is not None:
+            # JPEG only: decode at 1/2, 1/4 or 1/8 scale, still >= target.
+            # Only on files we opened, never on a caller's image object
+            img.draft("RGB", target)
+        if img.mode != "RGB":
+            img = img.convert("RGB")  # the one mode conversion
+        if target is not None and img.size != target:
+            img = img.resize(target, resample=self._geometry[1])
+        img.load()
+
+        if cache is not None:
+            cache.set(key, img)
+        return img
+
+    def _input_geometry(self):
+        # ((kind, size), resample) of the processor's resize step, None if unknown
+        pre = getattr(self._pipe(), "image_processor", None)
+        if pre is None or not getattr(pre, "do_resize", True):
+            return None
+        size = getattr(pre, "size", None) or {}
+        resample = getattr(pre, "resample", None)
+        resample = Image.BILINEAR if resample is None else resample
+        if "shortest_edge" in size:
+            return ("shortest_edge", int(size["shortest_edge"])), resample
+        if "height" in size and "width" in size:
+            return ("exact", (int(size["width"]), int(size["height"]))), resample
+        return None
+
+    def _target_size(self, size):
+        # (width, height) the processor would resize an image of `size` to
+        if self._geometry is None:
+            return None
+        (kind, value), _ = self._geometry
+        if kind == "exact":
+            return value
+        # Same rounding as transformers' get_resize_output_image_size
+        w, h = size
+        short, long = (w, h) if w <= h else (h, w)
+        new_long = int(value * long / short)
+        return (value, new_long) if w <= h else (new_long, value)
+
+    def _preprocessed_cache(self):
+        # Shared by every variant of this model id: quantization and backend
+        # don't change the input pixels
+        if self.preprocessed_cache_entries <= 0:
+            return None
+        return get_namespace(
+            f"{type(self).__name__}:{self.model_id}:preprocessed",
+            max_entries=self.preprocessed_cache_entries,
+            max_bytes=None,
+        )
+
+    def _format(self, results):
         # Return top 5 results with detailed information
         top_results = []
         for i, res in enumerate(results[:5]):
@@ -36,14 +213,22 @@ class ImageClassifier(LoggingMixin, CachingMixin, HFModelBase):
 
         # Primary result for backward compatibility
         primary = results[0]
-        out = {
+        return {
             "label": primary["label"],
             "score": float(primary["score"]),
             "top_predictions": top_results,
             "description": self._generate_description(top_results),
         }
-        self.set_cache(key, out)  # Cache result
-        return out
+
+    @staticmethod
+    def _cache_key(data):
+        # Files are hashed on their raw bytes (with an mtime+size fast path),
+        # in-memory images on their decoded pixels
+        if isinstance(data, str):
+            return ("img-file", file_digest(data))
+        if isinstance(data, bytes):
+            return ("img-file", bytes_digest(data))  # same key as that file on disk
+        return ("img-pixels", image_digest(data))
 
     def _generate_description(self, results):
         """Generate a human-readable description from classification results"""
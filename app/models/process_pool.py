@@ -0,0 +1,89 @@
+import multiprocessing
+from typing import List, Optional
+
+from app.models.registry import registry
+from app.utils.concurrency import configure_torch_threads, cpu_count
+
+# The model replica owned by this worker process
+_worker_model = None
+
+
+def _init_worker(
+    task: str, model_id: Optional[str], workers: int, quantize: bool, backend: str
+) -> None:
+    global _worker_model
+    configure_torch_threads(workers, force=True)  # cores / workers threads each
+    # With fork + preload the registry already holds the parent's model, so this
+    # is a lookup and the weights stay shared copy-on-write
+    _worker_model = registry.get(task, model_id, quantize=quantize, backend=backend)
+
+
+def _infer(item):
+    return _worker_model.infer(item)
+
+
+def _infer_batch(items):
+    return _worker_model.infer_batch(items)
+
+
+class ProcessReplicaPool:
+    """
+    N worker processes, each holding one model replica, so pre/post-processing
+    and forward passes run on all cores instead of behind one GIL.
+
+    With preload=True (and a platform that supports fork) the model is loaded
+    once in the parent before the workers fork, so they start instantly and
+    share the read-only weights through copy-on-write pages. Don't run
+    inference in the parent before creating the pool: forking after torch has
+    started its thread pools can hang the children.
+    """
+
+    def __init__(
+        self,
+        task: str,
+        model_id: Optional[str] = None,
+        workers: Optional[int] = None,
+        preload: bool = True,
+        batch_size: Optional[int] = None,
+        quantize: bool = False,
+        backend: str = "torch",
+    ):
+        self.task = task
+        self.workers = workers or cpu_count()
+        fork = preload and "fork" in multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("fork" if fork else "spawn")
+        model = registry.load(task, model_id, quantize=quantize, backend=backend) if fork else None
+        # Items sent to one worker per dispatch
+        self.batch_size = batch_size or (model.batch_size if model else 16)
+        self._pool = ctx.Pool(
+            self.workers, initializer=_init_worker, initargs=(task, model_id, self.workers, quantize, backend)
+        )
+
+    def infer(self, item):
+        return self._pool.apply(_infer, (item,))
+
+    def infer_async(self, item):
+        return self._pool.apply_async(_infer, (item,))
+
+    def infer_batch(self, items, batch_size: Optional[int] = None) -> List:
+        """Split items into per-worker batches, run them in parallel, keep input order."""
+        batch_size = batch_size or self.batch_size
+        chunks = [list(items[i:i + batch_size]) for i in range(0, len(items), batch_size)]
+        results: List = []
+        for part in self._pool.imap(_infer_batch, chunks):
+            results.extend(part)
+        return results
+
+    def close(self) -> None:
+        self._pool.close()
+        self._pool.join()
+
+    def terminate(self) -> None:
+        self._pool.terminate()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,226 @@
+import importlib
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.concurrency import configure_torch_threads
+
+# Task name -> "module:Class". Imported lazily so the registry itself is cheap
+_FACTORIES = {
+    "sentiment": "app.models.sentiment_model:SentimentModel",
+    "image": "app.models.image_classifier:ImageClassifier",
+}
+
+# Synthetic inputs used by warm(); i varies the text length / image colour so
+# each run is a distinct input (and a differently padded text batch)
+_WARM_INPUTS = {
+    "sentiment": lambda i: " ".join(["Warm-up sentence for the sentiment model."] * (1 + 8 * i)),
+    "image": lambda i: _blank_image(i),
+}
+
+
+def _blank_image(i: int = 0):
+    from PIL import Image
+
+    return Image.new("RGB", (256, 256), color=((127 + 40 * i) % 256, 127, 127))
+
+
+def _current_rss() -> int:
+    # Resident set size of this process in bytes (0 when it can't be read)
+    try:
+        with open("/proc/self/statm") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0
+
+
+def _model_class(task: str):
+    try:
+        target = _FACTORIES[task]
+    except KeyError:
+        raise ValueError(f"Unknown task: {task}") from None
+    module_name, cls_name = target.split(":")
+    return getattr(importlib.import_module(module_name), cls_name)
+
+
+class _Entry:
+    def __init__(self, model, load_sec: float, rss_delta: int):
+        self.model = model
+        self.load_sec = load_sec
+        self.rss_delta = rss_delta
+        self.loaded_at = time.time()
+        self.hits = 0
+
+
+class ModelRegistry:
+    """
+    Owns loaded HFModelBase instances so tasks can share one pipeline per
+    (task, model_id, device, dtype, quantize, backend) instead of rebuilding it on every run.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple, _Entry] = {}
+        self._lock = threading.RLock()
+        # One lock per key so two different models can load at the same time
+        self._load_locks: Dict[Tuple, threading.Lock] = {}
+
+    @staticmethod
+    def key(
+        task: str, model_id: Optional[str] = None, device=None, torch_dtype=None,
+        quantize: bool = False, backend: str = "torch",
+    ) -> Tuple:
+        task = (task or "").lower()
+        if model_id is None:
+            model_id = _model_class(task).DEFAULT_MODEL_ID
+        return (task, model_id, str(device) if device is not None else None,
+                str(torch_dtype) if torch_dtype is not None else None, bool(quantize), backend)
+
+    def get(self, task: str, model_id: Optional[str] = None, device=None, torch_dtype=None,
+            quantize: bool = False, backend: str = "torch"):
+        """Return the shared model for this key, loading it on first use."""
+        key = self.key(task, model_id, device, torch_dtype, quantize, backend)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.hits += 1
+                return entry.model
+        return self._load(key, device, torch_dtype).model
+
+    def load(self, task: str, model_id: Optional[str] = None, device=None, torch_dtype=None,
+             quantize: bool = False, backend: str = "torch"):
+        """Explicitly load a model (no-op if already resident)."""
+        key = self.key(task, model_id, device, torch_dtype, quantize, backend)
+        return self._load(key, device, torch_dtype).model
+
+    def _load(self, key: Tuple, device, torch_dtype) -> _Entry:
+        with self._lock:
+            lock = self._load_locks.setdefault(key, threading.Lock())
+        with lock:
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None:  # another thread finished loading first
+                return entry
+            cls = _model_class(key[0])
+            configure_torch_threads()  # only acts on $APP_TORCH_THREADS; before torch builds its pools
+            rss_before = _current_rss()
+            t = time.perf_counter()
+            model = cls(
+                key[1], device=device, torch_dtype=torch_dtype, quantize=key[4], backend=key[5]
+            )
+            entry = _Entry(model, time.perf_counter() - t, _current_rss() - rss_before)
+            with self._lock:
+                self._entries[key] = entry
+            return entry
+
+    def unload(self, task: str, model_id: Optional[str] = None, device=None, torch_dtype=None,
+               quantize: bool = False, backend: str = "torch") -> bool:
+        """Drop the registry's handle; returns False if it wasn't loaded."""
+        key = self.key(task, model_id, device, torch_dtype, quantize, backend)
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def unload_all(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def is_loaded(self, task: str, model_id: Optional[str] = None, device=None, torch_dtype=None,
+                  quantize: bool = False, backend: str = "torch") -> bool:
+        key = self.key(task, model_id, device, torch_dtype, quantize, backend)
+        with self._lock:
+            return key in self._entries
+
+    def warm(self, task: str, model_id: Optional[str] = None, device=None, torch_dtype=None,
+             quantize: bool = False, backend: str = "torch", runs: int = 3):
+        """
+        Load the model and push a few synthetic inputs through infer() and
+        infer_batch() so lazy kernel init and allocator growth happen now
+        rather than on the first real request. The result cache is bypassed.
+        """
+        from .base import cache_disabled
+
+        model = self.load(task, model_id, device, torch_dtype, quantize, backend)
+        make = _WARM_INPUTS[task.lower()]
+        with cache_disabled():
+            for i in range(runs):
+                model.infer(make(i))
+            model.infer_batch([make(i) for i in range(runs)])
+        return model
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Load time and memory for every resident model."""
+        with self._lock:
+            items = list(self._entries.items())
+        out = []
+        for (task, model_id, device, dtype, quantize, backend), entry in items:
+            out.append(
+                {
+                    "task": task,
+                    "model_id": model_id,
+                    "device": device,
+                    "dtype": dtype,
+                    "quantized": quantize,
+                    "backend": backend,
+                    "load_sec": round(entry.load_sec, 3),
+                    "weights_bytes": entry.model.memory_bytes(),
+                    "rss_delta_bytes": entry.rss_delta,
+                    "hits": entry.hits,
+                }
+            )
+        return out
+
+
+class WarmUp:
+    """
+    Loads and warms a set of tasks on a background thread and tracks each
+    one as pending -> loading -> ready (or error). Used by the server's
+    /readyz and the GUI status bar.
+    """
+
+    def __init__(self, tasks, runs: int = 3):
+        self.tasks = tuple(tasks)
+        self.runs = runs
+        self._states = {task: "pending" for task in self.tasks}
+        self._seconds: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def run(self) -> None:
+        for task in self.tasks:
+            self._states[task] = "loading"
+            t = time.perf_counter()
+            try:
+                registry.warm(task, runs=self.runs)
+            except Exception as e:
+                self._errors[task] = str(e)
+                self._states[task] = "error"
+                continue
+            self._seconds[task] = round(time.perf_counter() - t, 3)
+            self._states[task] = "ready"
+
+    def start(self) -> threading.Thread:
+        self._thread = threading.Thread(target=self.run, name="warm-up", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def skip(self) -> None:
+        """Report ready immediately; models load on their first request."""
+        self._states = {task: "ready" for task in self.tasks}
+
+    @property
+    def done(self) -> bool:
+        return all(s in ("ready", "error") for s in self._states.values())
+
+    def state(self) -> Dict[str, Any]:
+        states = dict(self._states)
+        return {
+            "ready": all(s == "ready" for s in states.values()),
+            "models": states,
+            "seconds": dict(self._seconds),
+            "errors": dict(self._errors),
+        }
+
+
+# Process-wide registry used by the GUI tasks and the CLI
+registry = ModelRegistry()
@@ -1,29 +1,195 @@
-from transformers import pipeline                     # Import Hugging Face pipeline
-from .base import HFModelBase, LoggingMixin, CachingMixin
+from .base import AsyncMixin, HFModelBase, LoggingMixin, CachingMixin
+from .tokenization import TokenizationStage
 from app.utils.decorators import timed, validate_input
 
-class SentimentModel(LoggingMixin, CachingMixin, HFModelBase):
+class SentimentModel(LoggingMixin, CachingMixin, AsyncMixin, HFModelBase):
     # This class handle the text sentiment analysis
 
-    def __init__(self, model_id: str = "distilbert-base-uncased-finetuned-sst-2-english"):
-        super().__init__(model_id)                    # Call base class constructor
-        # Createed the Hugging Face pipeline for the sentiment analysis
-        self._set_pipeline(pipeline("sentiment-analysis", model=model_id))
+    TASK = "sentiment"
+    HF_TASK = "sentiment-analysis"
+    DEFAULT_MODEL_ID = "distilbert-base-uncased-finetuned-sst-2-english"
+    batch_size = 32                       # default forward-pass size for infer_batch
+    max_length = 512                      # longer inputs are truncated to this many tokens
+
+    def __init__(
+        self, model_id: str = DEFAULT_MODEL_ID, device=None, torch_dtype=None, quantize: bool = False,
+        backend: str = "torch", onnx_dir: str | None = None,
+    ):
+        super().__init__(model_id, device, torch_dtype, quantize, backend, onnx_dir)  # Call base class constructor
+        # Createed the Hugging Face pipeline for the sentiment analysis (or the ONNX Runtime backend)
+        self._set_pipeline(self._build_backend(self.HF_TASK))
+        self._tokens = self._tokenization_stage()
+
+    def _tokenization_stage(self):
+        # Pre-tokenized batching needs the torch model and a fast tokenizer
+        pipe = self._pipe()
+        tokenizer = getattr(pipe, "tokenizer", None)
+        if self.backend != "torch" or not getattr(tokenizer, "is_fast", False):
+            return None
+        return TokenizationStage(tokenizer, self.max_length)
 
     @timed                           
     @validate_input(str)                  # suring input is a string
     def infer(self, data: str):
-        self.log("sentiment_infer_start", {"sample": data[:60]})  # Log the attempt
+        self.log("sentiment_infer_start", {"sample": data[:60]}, sampled=True)  # Log the attempt
         cache_key = ("sent", data)        # Createed the  cache key using input text
-        cached = self.get_cache(cache_key)
-        if cached:                        # If result already cached then return it
+        with self._span("cache_lookup"):
+            cached = self.get_cache(cache_key)
+        if cached is not None:            # If result already cached then return it
             return cached
 
-        res = self._pipe()(data)[0]       # Run the pipeline on text 
+        with self._span("forward"):       # pipeline tokenizes + runs the model
+            res = self._run_pipe(data, truncation=True, max_length=self.max_length)[0]  # Run the pipeline on text
         out = {"label": res["label"], "score": float(res["score"])}  
         self.set_cache(cache_key, out)    # the result is saved in cache
         return out                       
 
+    @timed
+    @validate_input((list, tuple))        # a sequence of strings
+    def infer_batch(self, texts, batch_size: int | None = None):
+        """
+        Score many texts with batched forward passes.
+        Cached and duplicate texts are only computed once, the rest are
+        tokenized in one pass and bucketed by token length so each batch pads
+        to similar sizes. Results come back in input order; stage timings go
+        to app.utils.metrics.
+        """
+        batch_size = batch_size or self.batch_size
+        self.log("sentiment_batch_start", {"count": len(texts), "batch_size": batch_size})
+        results = [None] * len(texts)
+        pending = {}                      # text -> indexes still waiting for a result
+
+        for i, text in enumerate(texts):
+            if not isinstance(text, str):
+                raise TypeError(f"Expected {str}, got {type(text)} at index {i}")
+            if text in pending:
+                pending[text].append(i)
+                continue
+            with self._span("cache_lookup"):
+                cached = self.get_cache(("sent", text))
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending[text] = [i]
+
+        score = self._score_tokenized if self._tokens is not None else self._score_pipeline
+        for text, out in score(list(pending), batch_size):
+            self.set_cache(("sent", text), out)
+            for i in pending[text]:
+                results[i] = out
+        return results
+
+    def _score_pipeline(self, texts, batch_size):
+        # Fallback (e.g. ONNX backend): length-sorted batches through the pipeline
+        todo = sorted(texts, key=len)
+        for start in range(0, len(todo), batch_size):
+            chunk = todo[start:start + batch_size]
+            with self._span("forward"):
+                outs = self._run_pipe(
+                    chunk, batch_size=len(chunk), truncation=True, max_length=self.max_length
+                )
+            for text, res in zip(chunk, outs):
+                yield text, {"label": res["label"], "score": float(res["score"])}
+
+    def _score_tokenized(self, texts, batch_size):
+        # Tokenize everything in one fast-tokenizer call (ids cached per text),
+        # then run token-length buckets straight through the model
+        with self._span("preprocess"), self._infer_lock:  # fast tokenizers aren't thread-safe either
+            ids = self._tokens.encode(texts)
+        for bucket in self._tokens.bucket(ids, batch_size):
+            labels, scores = self._forward_ids([ids[i] for i in bucket])
+            for i, label, score in zip(bucket, labels, scores):
+                yield texts[i], {"label": label, "score": score}
+
+    def _forward_ids(self, ids):
+        # Same result as the text-classification pipeline: softmax, top-1 label
+        probs = self._forward_probs(ids)
+        scores, best = probs.max(dim=-1)
+        id2label = self._pipe().model.config.id2label
+        return [id2label[int(b)] for b in best], [float(s) for s in scores]
+
+    def _forward_probs(self, ids):
+        # One padded forward pass; returns a (batch, labels) probability tensor
+        import torch
+
+        model = self._pipe().model
+        with self._span("forward"), self._infer_lock, torch.no_grad():
+            batch = self._tokens.collate(ids).to(model.device)
+            return model(**batch).logits.softmax(dim=-1).cpu()
+
+    @timed
+    @validate_input(str)
+    def infer_long(self, data: str, window: int | None = None, stride: int = 128,
+                   aggregate: str = "mean"):
+        """
+        Sentiment of a document longer than the model's 512-token limit.
+        The text is split into overlapping token windows, all windows are
+        scored in batches, and the per-window probabilities are combined:
+          mean     - average over windows
+          weighted - average weighted by each window's token count
+          max      - the single most confident window decides
+        The result includes per-chunk labels/scores under "chunks".
+        """
+        if aggregate not in ("mean", "weighted", "max"):
+            raise ValueError(f"Unknown aggregate: {aggregate}")
+        if self._tokens is None:
+            raise ValueError("infer_long needs the torch backend with a fast tokenizer")
+        # Longer windows would run past the position embeddings (or crash in them)
+        limit = min(
+            self.max_length,
+            getattr(self._pipe().model.config, "max_position_embeddings", None) or self.max_length,
+        )
+        window = window or limit
+        if window > limit:
+            raise ValueError(f"window must be at most {limit} tokens, got {window}")
+        if stride >= window - 2:  # leave room for [CLS]/[SEP]
+            raise ValueError("stride must be smaller than the window")
+
+        self.log("sentiment_long_start", {"chars": len(data), "window": window, "stride": stride})
+        cache_key = ("sent-long", data, window, stride, aggregate)
+        with self._span("cache_lookup"):
+            cached = self.get_cache(cache_key)
+        if cached is not None:
+            return cached
+
+        with self._span("preprocess"), self._infer_lock:
+            chunks = self._tokens.windows(data, window, stride)
+        probs = [p for start in range(0, len(chunks), self.batch_size)
+                 for p in self._forward_probs(chunks[start:start + self.batch_size])]
+        id2label = self._pipe().model.config.id2label
+
+        with self._span("postprocess"):
+            out = self._aggregate(chunks, probs, id2label, aggregate)
+        self.set_cache(cache_key, out)
+        return out
+
+    @staticmethod
+    def _aggregate(chunks, probs, id2label, aggregate):
+        # Combine per-window probabilities into one document-level result
+        if aggregate == "max":
+            best = max(range(len(probs)), key=lambda i: float(probs[i].max()))
+            combined = probs[best]
+        else:
+            weights = [len(c) if aggregate == "weighted" else 1 for c in chunks]
+            combined = sum(p * w for p, w in zip(probs, weights)) / sum(weights)
+        top = int(combined.argmax())
+
+        return {
+            "label": id2label[top],
+            "score": float(combined[top]),
+            "aggregate": aggregate,
+            "num_chunks": len(chunks),
+            "chunks": [
+                {
+                    "index": i,
+                    "tokens": len(c),
+                    "label": id2label[int(p.argmax())],
+                    "score": float(p.max()),
+                }
+                for i, (c, p) in enumerate(zip(chunks, probs))
+            ],
+        }
+
     def info(self) -> str:
         #  Description of this model for GUI/info display
         return "Sentiment analysis (DistilBERT, SST-2). Input: text. Output: POS/NEG + score."
\ No newline at end of file
@@ -0,0 +1,81 @@
+from typing import Dict, Iterator, List, Sequence
+
+from app.utils.cache import MISS, LRUCache
+
+
+class TokenizationStage:
+    """
+    Batch tokenization in front of a text model.
+
+    - Uncached texts are tokenized with one call to the fast tokenizer.
+    - Token ids are cached per string, so repeated texts skip tokenization.
+    - Inputs are truncated to `max_length` tokens.
+    - bucket() sorts inputs by token length and cuts full batches, so each
+      padded batch wastes little compute on padding.
+    """
+
+    def __init__(
+        self, tokenizer, max_length: int = 512, max_padding_waste: float = 0.5,
+        cache_entries: int = 16384, cache_bytes: int = 32 * 1024 * 1024,
+    ):
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self.max_padding_waste = max_padding_waste
+        # A 512-token entry is ~20 KB with its text key, so the byte limit is
+        # what keeps this flat; the entry limit only bites for short texts
+        self._ids = LRUCache(max_entries=cache_entries, max_bytes=cache_bytes)
+
+    def encode(self, texts: Sequence[str]) -> List[List[int]]:
+        """Token ids (with special tokens) for each text, in input order."""
+        out: List = [self._ids.get(t, MISS) for t in texts]
+        missing = list(dict.fromkeys(t for t, ids in zip(texts, out) if ids is MISS))
+        if missing:
+            encoded = self.tokenizer(missing, truncation=True, max_length=self.max_length)["input_ids"]
+            fresh: Dict[str, List[int]] = dict(zip(missing, encoded))
+            for text, ids in fresh.items():
+                self._ids.set(text, ids)
+            out = [fresh[t] if ids is MISS else ids for t, ids in zip(texts, out)]
+        return out
+
+    def windows(self, text: str, window: int | None = None, stride: int = 128) -> List[List[int]]:
+        """
+        Split one long text into overlapping token windows of at most `window`
+        tokens (special tokens included), consecutive windows sharing `stride`
+        tokens. Short texts come back as a single window.
+        """
+        window = window or self.max_length
+        return self.tokenizer(
+            text, truncation=True, max_length=window, stride=stride,
+            return_overflowing_tokens=True,
+        )["input_ids"]
+
+    def bucket(self, ids: Sequence[List[int]], batch_size: int) -> Iterator[List[int]]:
+        """
+        Yield lists of indexes into `ids`, shortest inputs first. A batch is
+        cut at batch_size, or earlier once it is at least half full and the
+        next (longer) input would make more than max_padding_waste of the
+        padded batch padding. Fewer, fuller forward passes beat tightly
+        matched lengths, so small groups are never split off on their own.
+        """
+        order = sorted(range(len(ids)), key=lambda i: len(ids[i]))
+        batch: List[int] = []
+        tokens = 0  # real tokens in the batch
+        for i in order:
+            n = len(ids[i])  # sorted, so this is the padded length if i joins
+            if batch and (
+                len(batch) == batch_size
+                or (
+                    len(batch) >= batch_size // 2
+                    and 1 - (tokens + n) / ((len(batch) + 1) * n) > self.max_padding_waste
+                )
+            ):
+                yield batch
+                batch, tokens = [], 0
+            batch.append(i)
+            tokens += n
+        if batch:
+            yield batch
+
+    def collate(self, ids: Sequence[List[int]]):
+        """Pad one bucket to its longest member and return torch tensors."""
+        return self.tokenizer.pad({"input_ids": list(ids)}, padding=True, return_tensors="pt")
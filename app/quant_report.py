@@ -0,0 +1,142 @@
+"""
+Accuracy vs latency of dynamic INT8 quantization against fp32.
+
+    python -m app.quant_report [--repeat 5] [--json report.json]
+
+Both variants run the same fixed samples straight through the pipeline
+(bypassing the result cache) and the report shows load time, weight size,
+median/p95 latency, agreement with fp32 and, for sentiment, accuracy on the
+labelled sentences below.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+from app.models.registry import registry
+
+# Fixed, labelled sentiment samples (mix of short and longer inputs)
+SENTIMENT_SAMPLES = [
+    ("I love this project! It's amazing and works perfectly.", "POSITIVE"),
+    ("This is the worst experience I have had.", "NEGATIVE"),
+    ("The food was cold and the staff ignored us.", "NEGATIVE"),
+    ("Absolutely fantastic service, I will come back again.", "POSITIVE"),
+    ("The battery died after two hours, very disappointing.", "NEGATIVE"),
+    ("A beautiful, moving film with brilliant performances.", "POSITIVE"),
+    ("It broke on the first day and support never replied.", "NEGATIVE"),
+    ("Great value for money and fast delivery.", "POSITIVE"),
+    ("I wouldn't recommend this to anyone.", "NEGATIVE"),
+    ("The lecture was clear, engaging and really useful.", "POSITIVE"),
+    ("Terrible plot, wooden acting and far too long.", "NEGATIVE"),
+    ("My new phone is fast and the camera is superb.", "POSITIVE"),
+    ("The hotel room was dirty and smelled awful.", "NEGATIVE"),
+    ("What a delightful surprise, everything exceeded expectations.", "POSITIVE"),
+    ("Setup was confusing and the instructions were useless.", "NEGATIVE"),
+    ("Friendly people, lovely weather and a relaxing holiday.", "POSITIVE"),
+]
+
+ASSETS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+
+
+def _image_samples():
+    from PIL import Image
+
+    paths = sorted(
+        os.path.join(ASSETS, f) for f in os.listdir(ASSETS)
+        if f.lower().endswith((".jpg", ".jpeg", ".png"))
+    )
+    return [Image.open(p).convert("RGB") for p in paths]
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _top1(raw):
+    # Pipelines return a dict per text or a list of dicts per image
+    return raw[0] if isinstance(raw, list) else raw
+
+
+def _measure(task: str, quantize: bool, samples, repeat: int) -> dict:
+    t = time.perf_counter()
+    model = registry.load(task, quantize=quantize)
+    load_sec = time.perf_counter() - t
+    model._run_pipe(samples[0])  # warm-up, not timed
+
+    latencies, predictions = [], []
+    for sample in samples:
+        for _ in range(repeat):
+            t = time.perf_counter()
+            raw = model._run_pipe(sample)
+            latencies.append(time.perf_counter() - t)
+        top = _top1(raw)
+        predictions.append((top["label"], float(top["score"])))
+    registry.unload(task, quantize=quantize)
+
+    return {
+        "load_sec": round(load_sec, 3),
+        "weights_mb": round(model.memory_bytes() / 1e6, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "predictions": predictions,
+    }
+
+
+def compare(task: str, samples, labels=None, repeat: int = 5) -> dict:
+    fp32 = _measure(task, False, samples, repeat)
+    int8 = _measure(task, True, samples, repeat)
+    pairs = list(zip(fp32.pop("predictions"), int8.pop("predictions")))
+    report = {
+        "task": task,
+        "samples": len(samples),
+        "fp32": fp32,
+        "int8": int8,
+        "label_agreement": round(sum(a[0] == b[0] for a, b in pairs) / len(pairs), 4),
+        "max_score_diff": round(max(abs(a[1] - b[1]) for a, b in pairs), 4),
+        "speedup_p50": round(fp32["p50_ms"] / int8["p50_ms"], 2) if int8["p50_ms"] else None,
+    }
+    if labels:
+        for name, idx in (("fp32", 0), ("int8", 1)):
+            hits = sum(p[idx][0] == gold for p, gold in zip(pairs, labels))
+            report[name]["accuracy"] = round(hits / len(labels), 4)
+    return report
+
+
+def main():
+    p = argparse.ArgumentParser(description="Compare INT8 dynamic quantization with fp32")
+    p.add_argument("--tasks", default="sentiment,image")
+    p.add_argument("--repeat", type=int, default=5, help="Timed runs per sample")
+    p.add_argument("--json", help="Also write the report to this file")
+    args = p.parse_args()
+
+    reports = []
+    for task in [t.strip() for t in args.tasks.split(",") if t.strip()]:
+        if task == "sentiment":
+            texts = [t for t, _ in SENTIMENT_SAMPLES]
+            labels = [label for _, label in SENTIMENT_SAMPLES]
+            reports.append(compare("sentiment", texts, labels, args.repeat))
+        elif task == "image":
+            reports.append(compare("image", _image_samples(), repeat=args.repeat))
+
+    for r in reports:
+        print(f"== {r['task']} ({r['samples']} samples)")
+        for name in ("fp32", "int8"):
+            v = r[name]
+            acc = f"  acc {v['accuracy']:.1%}" if "accuracy" in v else ""
+            print(
+                f"  {name}: load {v['load_sec']}s  weights {v['weights_mb']}MB  "
+                f"p50 {v['p50_ms']}ms  p95 {v['p95_ms']}ms{acc}"
+            )
+        print(
+            f"  agreement {r['label_agreement']:.1%}  max score diff {r['max_score_diff']}  "
+            f"speedup x{r['speedup_p50']}"
+        )
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(reports, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+Long-lived local inference server.
+
+    python -m app.server --port 8000 --tasks sentiment,image
+
+Endpoints:
+    POST /sentiment   {"text": "..."} or {"texts": [...]}
+    POST /image       {"path": "..."} / {"paths": [...]} or raw image bytes (Content-Type: image/*)
+    GET  /healthz     process is up
+    GET  /readyz      200 once every configured model is loaded and warmed, else 503
+    GET  /stats       model registry, cache, micro-batching and latency statistics
+    GET  /metrics     per-model, per-stage latency histograms (Prometheus text format)
+
+With --batch-window-ms > 0, single-item requests are coalesced by a
+MicroBatcher into batched forward passes.
+
+Request bodies over --max-body-bytes are refused with 413. Image paths are
+opened by the server process, so without --image-root any caller can have it
+read any image file it can access: the server trusts its (by default local)
+callers. With --image-root, paths are resolved against that folder and
+anything outside it is refused with 403.
+"""
+import argparse
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.models.batching import MicroBatcher
+from app.models.registry import WarmUp, registry
+from app.utils.metrics import metrics
+
+TASKS = ("sentiment", "image")
+
+
+class _Busy(Exception):
+    # Raised when the request queue is full; turned into a 503
+    pass
+
+
+class _TooLarge(Exception):
+    # Raised when Content-Length exceeds max_body_bytes; turned into a 413
+    pass
+
+
+class InferenceServer(ThreadingHTTPServer):
+    """
+    ThreadingHTTPServer that keeps models resident in the shared registry.
+    At most `max_concurrency` requests run inference at once and at most
+    `max_queue` more may wait; anything beyond that is rejected with 503.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        tasks=TASKS,
+        max_concurrency: int = 2,
+        max_queue: int = 64,
+        batch_window_ms: float = 0.0,
+        max_batch_size: int = 32,
+        max_body_bytes: int = 32 * 1024 * 1024,
+        image_root: str | None = None,
+    ):
+        super().__init__(address, _Handler)
+        self.tasks = tuple(tasks)
+        self.max_body_bytes = max_body_bytes
+        self.image_root = os.path.realpath(image_root) if image_root else None
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._admitted = threading.BoundedSemaphore(max_concurrency + max_queue)
+        self._warm_up = WarmUp(self.tasks)
+        self._batch_window_ms = batch_window_ms
+        self._max_batch_size = max_batch_size
+        self._batchers = {}
+        self._batchers_lock = threading.Lock()
+
+    # ---- readiness -------------------------------------------------------
+
+    def warm_up(self) -> None:
+        """Load and warm every configured model (blocking)."""
+        self._warm_up.run()
+
+    def start_warm_up(self) -> threading.Thread:
+        return self._warm_up.start()
+
+    def skip_warm_up(self) -> None:
+        """Report ready immediately; models load on their first request."""
+        self._warm_up.skip()
+
+    def readiness(self) -> dict:
+        # {"ready": bool, "models": {task: pending|loading|ready|error}, "seconds", "errors"}
+        return self._warm_up.state()
+
+    # ---- inference -------------------------------------------------------
+
+    def _batcher(self, task: str):
+        with self._batchers_lock:
+            if task not in self._batchers:
+                self._batchers[task] = MicroBatcher(
+                    registry.get(task), self._max_batch_size, self._batch_window_ms
+                )
+            return self._batchers[task]
+
+    def resolve_path(self, path) -> str:
+        """The path to open for a client-supplied image path; PermissionError if not allowed."""
+        if not isinstance(path, str):
+            raise TypeError(f"Expected a path string, got {type(path).__name__}")
+        if self.image_root is None:
+            return path
+        # realpath follows symlinks and "..", so neither can escape the root.
+        # Nothing is stat()ed first: the answer is the same whether it exists or not
+        real = os.path.realpath(os.path.join(self.image_root, path))
+        if os.path.commonpath([real, self.image_root]) != self.image_root:
+            raise PermissionError(path)
+        return real
+
+    def batching_stats(self) -> dict:
+        with self._batchers_lock:
+            return {task: b.stats() for task, b in self._batchers.items()}
+
+    def run(self, task: str, data):
+        if task not in self.tasks:
+            raise LookupError(f"Task not served: {task}")
+        if not self._admitted.acquire(blocking=False):
+            raise _Busy("Request queue is full")
+        try:
+            if self._batch_window_ms > 0 and not isinstance(data, list):
+                # The batcher's single worker already serialises forward passes,
+                # so waiting callers don't hold an inference slot
+                return self._batcher(task).infer(data)
+            with self._slots:
+                model = registry.get(task)
+                if isinstance(data, list):
+                    return model.infer_batch(data)
+                return model.infer(data)
+        finally:
+            self._admitted.release()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: InferenceServer
+
+    def log_message(self, fmt, *args):  # keep stderr quiet; models log their own events
+        pass
+
+    def _send(self, status: int, payload, content_type: str = "application/json") -> None:
+        body = payload.encode() if isinstance(payload, str) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if status == 503:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._send(200, {"status": "ok"})
+        elif self.path == "/readyz":
+            state = self.server.readiness()
+            self._send(200 if state["ready"] else 503, state)
+        elif self.path == "/stats":
+            from app.utils.cache import all_stats
+
+            self._send(
+                200,
+                {
+                    "models": registry.stats(),
+                    "caches": all_stats(),
+                    "batching": self.server.batching_stats(),
+                    "latency": metrics.to_json(),
+                },
+            )
+        elif self.path == "/metrics":
+            self._send(200, metrics.to_prometheus(), "text/plain; version=0.0.4")
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_POST(self):
+        task = self.path.strip("/")
+        if task not in TASKS:
+            self._send(404, {"error": "Not found"})
+            return
+        try:
+            data = self._read_input(task)
+            result = self.server.run(task, data)
+        except _Busy as e:
+            self._send(503, {"error": str(e)})
+        except _TooLarge as e:
+            self.close_connection = True  # the unread body must not be parsed as a request
+            self._send(413, {"error": str(e)})
+        except LookupError as e:
+            self._send(404, {"error": str(e)})
+        except PermissionError:
+            self._send(403, {"error": "Path not allowed"})
+        except OSError:
+            # Generic on purpose: the error text would tell callers whether a path exists
+            self._send(400, {"error": "Could not read input"})
+        except (ValueError, TypeError) as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+        else:
+            self._send(200, result)
+
+    def _read_input(self, task: str):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length < 0:
+            raise ValueError("Invalid Content-Length")
+        if length > self.server.max_body_bytes:
+            raise _TooLarge(f"Body larger than {self.server.max_body_bytes} bytes")
+        raw = self.rfile.read(length)
+        ctype = self.headers.get("Content-Type", "")
+
+        if task == "image" and ctype.startswith("image/"):
+            # Passed through encoded: the model hashes the bytes and decodes
+            # them on its draft() fast path, like a file path
+            return raw
+
+        body = json.loads(raw or b"{}")
+        if not isinstance(body, dict):
+            raise ValueError("Expected a JSON object")
+        if task == "sentiment":
+            if "texts" in body:
+                return _str_list(body, "texts")
+            if "text" in body:
+                return _str(body, "text")
+            raise ValueError("Expected 'text' or 'texts'")
+        if "paths" in body:
+            return [self.server.resolve_path(p) for p in _str_list(body, "paths")]
+        if "path" in body:
+            return self.server.resolve_path(_str(body, "path"))
+        raise ValueError("Expected 'path', 'paths' or an image/* body")
+
+
+def _str(body: dict, field: str) -> str:
+    # A list here would silently turn a single request into a batch
+    if not isinstance(body[field], str):
+        raise ValueError(f"'{field}' must be a string")
+    return body[field]
+
+
+def _str_list(body: dict, field: str) -> list:
+    # list("abc") would split a bare string into one request per character
+    value = body[field]
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"'{field}' must be a list of strings")
+    return value
+
+
+def main():
+    p = argparse.ArgumentParser(description="Local HTTP inference server")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8000)
+    p.add_argument("--tasks", default=",".join(TASKS), help="Comma separated: sentiment,image")
+    p.add_argument("--max-concurrency", type=int, default=2, help="Inferences running at once")
+    p.add_argument("--max-queue", type=int, default=64, help="Requests allowed to wait")
+    p.add_argument(
+        "--batch-window-ms", type=float, default=0.0,
+        help="Coalesce single requests arriving within this window (0 = off)",
+    )
+    p.add_argument("--max-batch-size", type=int, default=32, help="Largest coalesced batch")
+    p.add_argument(
+        "--max-body-bytes", type=int, default=32 * 1024 * 1024,
+        help="Largest accepted request body; bigger ones get 413",
+    )
+    p.add_argument(
+        "--image-root",
+        help="Only open image paths inside this folder (default: any path; callers are trusted)",
+    )
+    p.add_argument("--cache-db", help="SQLite file for a persistent result cache")
+    p.add_argument("--no-warm", action="store_true", help="Load models on first request instead")
+    p.add_argument("--log-format", choices=("json", "text"), help="Model event log format (default json)")
+    p.add_argument(
+        "--log-sample", type=float,
+        help="Share of per-request log events kept, 0.0-1.0 (default $APP_LOG_SAMPLE or 1.0)",
+    )
+    args = p.parse_args()
+
+    tasks = [t.strip() for t in args.tasks.split(",") if t.strip()]
+    unknown = set(tasks) - set(TASKS)
+    if unknown:
+        p.error(f"Unknown task(s): {', '.join(sorted(unknown))}")
+
+    from app.utils.log import configure_logging
+
+    configure_logging(fmt=args.log_format, sample_rate=args.log_sample)
+
+    if args.cache_db:
+        from app.utils.disk_cache import configure_disk_cache
+
+        configure_disk_cache(args.cache_db)
+
+    server = InferenceServer(
+        (args.host, args.port), tasks, args.max_concurrency, args.max_queue,
+        args.batch_window_ms, args.max_batch_size, args.max_body_bytes, args.image_root,
+    )
+    if args.no_warm:
+        server.skip_warm_up()
+    else:
+        server.start_warm_up()
+    print(f"Serving {', '.join(tasks)} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,13 @@
+import subprocess
+import sys
+from pathlib import Path
 from app.models.sentiment_model import SentimentModel
-from app.models.image_model import ImageClassifier
+
+ROOT = Path(__file__).resolve().parent.parent
+# Heavy packages the CLI must not import for --help, bad arguments or sentiment setup
+HEAVY_MODULES = ("transformers", "torch", "PIL")
+# Upper bound (seconds) for importing everything `cli.py --help` needs
+STARTUP_BUDGET_SEC = 0.5
 
 def test_sentiment():
     # Created the sentiment model and print description
@@ -17,6 +25,8 @@ def test_sentiment():
         print()
 
 def test_image():
+    from app.models.image_classifier import ImageClassifier  # pulls in PIL
+
     # Created the image classifier and print description
     m = ImageClassifier()
     print("INFO:", m.info())
@@ -25,10 +35,497 @@ def test_image():
     print("IMAGE:", path)
     print(" ->", m.infer(path))  # this is the prediction
 
+def test_onnx_parity(tmp_path):
+    # The ONNX Runtime backend must agree with the torch pipeline
+    import pytest
+
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("transformers")
+    from app.models.backends import export_onnx
+    from app.models.image_classifier import ImageClassifier
+    from PIL import Image
+
+    texts = ["I  love to Study on Darwin!", "This is the worst experience I have had."]
+    out = export_onnx(SentimentModel.HF_TASK, SentimentModel.DEFAULT_MODEL_ID, str(tmp_path / "sent"))
+    ref, onnx = SentimentModel(), SentimentModel(backend="onnx", onnx_dir=out)
+    # _run_pipe skips the result cache so both backends really run
+    for a, b in zip(ref._run_pipe(texts), onnx._run_pipe(texts)):
+        assert a["label"] == b["label"]
+        assert abs(a["score"] - b["score"]) < 1e-3
+
+    img = Image.open(ROOT / "assets" / "sample.jpg").convert("RGB")
+    out = export_onnx(ImageClassifier.HF_TASK, ImageClassifier.DEFAULT_MODEL_ID, str(tmp_path / "img"))
+    ref, onnx = ImageClassifier(), ImageClassifier(backend="onnx", onnx_dir=out)
+    a, b = ref._run_pipe(img)[0], onnx._run_pipe(img)[0]
+    assert a["label"] == b["label"]
+    assert abs(a["score"] - b["score"]) < 1e-2
+
+
+def _import_profile(*args):
+    # Runs the CLI under -X importtime; returns {module: cumulative_us}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", str(ROOT / "cli.py"), *args],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            modules[name[1:].rstrip()] = int(cumulative)  # keep nesting indent
+    return modules
+
+
+def test_cli_startup():
+    # --help and argument errors must stay light
+    for args in (["--help"], ["sentiment"], ["image", "--path"]):
+        modules = _import_profile(*args)
+        heavy = [m for m in modules if m.split(".")[0] in HEAVY_MODULES]
+        assert not heavy, f"cli.py {' '.join(args)} imported {heavy}"
+
+    # Top-level imports only (no leading spaces) so nested time isn't double counted
+    total_us = sum(us for name, us in _import_profile("--help").items() if name == name.lstrip())
+    print(f"cli.py --help import time: {total_us / 1e6:.3f}s")
+    assert total_us / 1e6 < STARTUP_BUDGET_SEC
+
+
+def test_sentiment_import_is_light():
+    code = (
+        "import sys, app.models.registry as r, app.gui.tasks; "
+        "r.ModelRegistry.key('sentiment'); "
+        f"print([m for m in sys.modules if m.split('.')[0] in {HEAVY_MODULES!r}])"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    assert out.stdout.strip() == "[]", out.stdout + out.stderr
+
+
+
+def test_structured_logging():
+    import io
+    import json
+    from app.utils.log import configure_logging, get_logger, log_event, shutdown_logging
+
+    stream = io.StringIO()
+    configure_logging(fmt="json", sample_rate=0.0, stream=stream)
+    logger = get_logger("tests")
+    try:
+        log_event(logger, "kept", {"n": 1})
+        log_event(logger, "dropped", {"n": 2}, sampled=True)  # sampled at rate 0
+    finally:
+        shutdown_logging()  # flushes the queue
+        configure_logging()
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(r["event"], r["detail"]) for r in lines] == [("kept", {"n": 1})]
+
+
+
+def test_async_facade():
+    import asyncio
+    import threading
+    import time
+    from app.models.base import AsyncMixin
+
+    class Slow(AsyncMixin):
+        async_max_pending = 2
+        async_chunk = 2
+
+        def __init__(self):
+            self.running = 0
+            self.peak = 0
+            self.lock = threading.Lock()
+
+        def infer(self, data):
+            with self.lock:
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+            time.sleep(0.05)
+            with self.lock:
+                self.running -= 1
+            return {"echo": data}
+
+        def infer_batch(self, items, batch_size=None):
+            return [self.infer(x) for x in items]
+
+    async def main():
+        model = Slow()
+        results = await asyncio.gather(*(model.ainfer(i) for i in range(6)))
+        assert [r["echo"] for r in results] == list(range(6))
+        assert model.peak <= 2                       # bounded by async_max_pending
+        assert [r["echo"] for r in await model.ainfer_batch([1, 2, 3])] == [1, 2, 3]
+        try:
+            await model.ainfer("late", timeout=0.01)
+        except asyncio.TimeoutError:
+            pass
+        else:
+            raise AssertionError("expected a timeout")
+
+    asyncio.run(main())
+
+
+
+def test_gui_worker_queue():
+    import threading
+    import time
+    from app.gui.worker import InferenceWorker
+
+    worker = InferenceWorker()
+    gate = threading.Event()
+
+    def steps(job):
+        for i in range(3):
+            gate.wait(1)
+            job.progress(i + 1, 3)
+        return "ok"
+
+    first = worker.submit(steps)
+    failing = worker.submit(lambda job: 1 / 0)
+    skipped = worker.submit(steps)
+    skipped.cancel()                      # still queued: never runs
+    gate.set()
+    deadline = time.monotonic() + 5
+    while worker.pending() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    worker.close()
+
+    events = [(kind, job.id) for kind, job, _ in worker.poll()]
+    assert ("done", first.id) in events
+    assert ("error", failing.id) in events
+    assert ("cancelled", skipped.id) in events
+    assert ("started", skipped.id) not in events
+    assert worker.pending() == []
+
+
+
+def test_result_history_ring(tmp_path):
+    import json
+    from app.gui.history import ResultHistory
+
+    history = ResultHistory(max_results=3)
+    for i in range(5):
+        history.append("Sentiment", {"label": "POSITIVE", "score": i / 10}, source=f"text {i}")
+    assert len(history) == 3 and history.dropped == 2
+    assert [r["input"] for r in history.window(0, 3)] == ["text 2", "text 3", "text 4"]
+    assert history.index_of(history[1]["id"]) == 1 and history.index_of(1) is None
+
+    path = tmp_path / "history.jsonl"
+    assert history.export_jsonl(str(path)) == 3
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["result"]["score"] for r in rows] == [0.2, 0.3, 0.4]
+
+
+
+def test_image_fast_path(tmp_path):
+    import pytest
+
+    Image = pytest.importorskip("PIL.Image")
+    from app.models.image_classifier import ImageClassifier
+
+    # No pipeline needed: just the resize geometry MobileViT's processor uses
+    model = ImageClassifier.__new__(ImageClassifier)
+    model._model_id = "test"
+    model._geometry = (("shortest_edge", 288), Image.BILINEAR)
+    model.preprocessed_cache_entries = 4
+
+    path = tmp_path / "photo.jpg"
+    Image.new("RGB", (4000, 3000), (200, 120, 40)).save(path, quality=90)
+    img = model._prepare(str(path), key=("img-file", "photo"))
+    assert img.mode == "RGB" and img.size == (384, 288)
+    assert model._prepare(str(path), key=("img-file", "photo")) is img  # preprocessed cache hit
+
+    gray = Image.new("L", (300, 600))
+    assert model._prepare(gray).size == (288, 576) and gray.size == (300, 600)
+
+    # Uploaded bytes share the file's cache key and take the same draft path
+    raw = path.read_bytes()
+    assert model._cache_key(raw) == model._cache_key(str(path))
+    assert model._prepare(raw).size == (384, 288)
+
+
+def test_micro_batcher_isolates_bad_items():
+    from app.models.batching import MicroBatcher
+
+    class Upper:
+        def infer(self, text):
+            if not isinstance(text, str):
+                raise TypeError(f"expected str, got {type(text).__name__}")
+            return text.upper()
+
+        def infer_batch(self, items):
+            return [self.infer(t) for t in items]
+
+    batcher = MicroBatcher(Upper(), max_wait_ms=200)
+    good, bad = batcher.submit("good"), batcher.submit(5)
+    assert good.result(5) == "GOOD"
+    assert isinstance(bad.exception(5), TypeError)
+    batcher.close()
+    assert batcher.stats()["batches"] == 1
+
+
+def test_lru_cache(monkeypatch):
+    from app.utils import cache as cache_mod
+    from app.utils.cache import MISS, LRUCache, approx_size
+
+    lru = LRUCache(max_entries=2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")                          # "b" is now least recently used
+    lru.set("c", 3)
+    assert "b" not in lru and lru.get("a") == 1 and lru.stats()["evictions"] == 1
+
+    # Large keys count towards the byte limit, not just the values
+    key = "x" * 10_000
+    lru = LRUCache(max_bytes=approx_size(key) + 100)
+    lru.set(key, 1)
+    assert lru.stats()["bytes"] >= approx_size(key)
+    lru.set("y" * 10_000, 1)
+    assert key not in lru and len(lru) == 1
+
+    # Falsy results are hits, not misses
+    lru = LRUCache()
+    for k, v in (("zero", 0), ("empty", ""), ("none", [])):
+        lru.set(k, v)
+        assert lru.get(k) is not MISS
+    assert lru.stats()["hits"] == 3 and lru.stats()["misses"] == 0
+
+    now = [1000.0]
+    monkeypatch.setattr(cache_mod.time, "monotonic", lambda: now[0])
+    lru = LRUCache(ttl=10)
+    lru.set("k", "v")
+    now[0] += 9
+    assert lru.get("k") == "v"
+    now[0] += 2
+    assert lru.get("k") is MISS and lru.stats()["expirations"] == 1
+
+
+def test_disk_cache(tmp_path, monkeypatch):
+    import sqlite3
+    from app.models.base import CachingMixin
+    from app.utils import disk_cache
+    from app.utils.disk_cache import DiskCache
+
+    db = str(tmp_path / "cache.db")
+    disk = DiskCache(db, max_bytes=10_000)
+    for i in range(100):
+        disk.set("ns", i, "x" * 500)
+    disk.get("ns", 0)                     # oldest write, but most recently hit
+    assert disk.evict() > 0
+    assert disk.stats()["bytes"] <= 10_000
+    assert disk.get("ns", 0) is not None and disk.get("ns", 1) is None
+
+    # Another process sees rows written here, and vice versa
+    disk.set("ns", "parent", {"label": "POSITIVE"})
+    code = (
+        "import sys; from app.utils.disk_cache import DiskCache; d = DiskCache(sys.argv[1]);"
+        "assert d.get('ns', 'parent') == {'label': 'POSITIVE'}; d.set('ns', 'child', [1, 2])"
+    )
+    subprocess.run([sys.executable, "-c", code, db], check=True, cwd=ROOT)
+    assert disk.get("ns", "child") == [1, 2]
+
+    # A failing disk tier degrades to a miss / skipped write instead of raising
+    class Cached(CachingMixin):
+        cache_max_entries = 0             # every lookup goes to disk
+
+    def locked(*args):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(disk_cache, "_disk_cache", disk)
+    monkeypatch.setattr(disk_cache, "_configured", True)
+    model = Cached()
+    model.set_cache("unencodable", {1, 2})  # sets aren't JSON
+    monkeypatch.setattr(disk, "get", locked)
+    monkeypatch.setattr(disk, "set", locked)
+    model.set_cache("k", 1)
+    assert model.get_cache("k", "miss") == "miss"
+
+
+def test_streaming_inputs(tmp_path):
+    import pytest
+    from app.utils.streaming import chunked, read_text_records
+
+    jsonl = tmp_path / "in.jsonl"
+    jsonl.write_text('{"id": "a", "text": "good"}\n\n{"text": "bad"}\n', encoding="utf-8")
+    assert list(read_text_records(str(jsonl))) == [("a", "good"), (1, "bad")]
+
+    table = tmp_path / "in.csv"
+    table.write_text("key,body\nx,\"fine, really\"\ny,meh\n", encoding="utf-8")
+    records = read_text_records(str(table), text_field="body", id_field="key")
+    assert list(records) == [("x", "fine, really"), ("y", "meh")]
+
+    plain = tmp_path / "in.txt"
+    plain.write_bytes(b'first\r\n\r\n{"not": "parsed"}\r\n')  # CRLF must not leave "\r" behind
+    assert list(read_text_records(str(plain))) == [(0, "first"), (1, '{"not": "parsed"}')]
+
+    with pytest.raises(ValueError):
+        list(read_text_records(str(jsonl), text_field="missing"))
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 3)) == []
+
+
+def test_bulk_checkpoint_resume(tmp_path, monkeypatch):
+    import json
+    import os
+    import pytest
+
+    monkeypatch.syspath_prepend(str(ROOT))
+    import cli
+    from app.models.registry import registry
+    from app.utils.streaming import read_text_records
+
+    class Flaky:
+        batch_size = 2
+        fail_after = 1  # batches before the simulated crash
+
+        def infer_batch(self, texts, batch_size=None):
+            if self.fail_after == 0:
+                raise KeyboardInterrupt  # the run is killed mid-way
+            if "bad" in texts:
+                raise ValueError("unreadable record")
+            self.fail_after -= 1
+            return [{"label": t.upper()} for t in texts]
+
+    model = Flaky()
+    monkeypatch.setattr(registry, "get", lambda *a, **k: model)
+    src, out, ckpt = tmp_path / "in.txt", tmp_path / "out.jsonl", tmp_path / "ckpt.json"
+    src.write_text("a\nb\nbad\nd\ne\n", encoding="utf-8")
+
+    def run():
+        return cli.run_bulk("sentiment", read_text_records(str(src)), str(out),
+                            checkpoint=str(ckpt), source=str(src))
+
+    with pytest.raises(KeyboardInterrupt):
+        run()
+    assert json.loads(ckpt.read_text())["done"] == 2
+    model.fail_after = 99
+    assert run() == 5  # the bad record is reported, not fatal
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [r["id"] for r in rows] == [0, 1, 2, 3, 4]
+    assert rows[2] == {"id": 2, "error": "unreadable record"} and rows[3]["label"] == "D"
+
+    # A modified input must not be resumed from the old position
+    src.write_text("a\nb\nc\nd\ne\nf\n", encoding="utf-8")
+    os.utime(src, ns=(1, 1))
+    with pytest.raises(ValueError, match="different or modified input"):
+        run()
+
+    # Folders: an image added in a subfolder changes the fingerprint
+    from app.utils.streaming import Checkpoint
+
+    (tmp_path / "imgs" / "sub").mkdir(parents=True)
+    (tmp_path / "imgs" / "a.jpg").write_bytes(b"x")
+    before = Checkpoint(str(ckpt), str(tmp_path / "imgs")).source
+    (tmp_path / "imgs" / "sub" / "b.jpg").write_bytes(b"y")
+    assert Checkpoint(str(ckpt), str(tmp_path / "imgs")).source != before
+
+
+def test_server_input_limits(tmp_path):
+    import http.client
+    import json
+    import threading
+    from app.server import InferenceServer
+
+    (tmp_path / "ok").mkdir()
+    server = InferenceServer(("127.0.0.1", 0), max_body_bytes=1024, image_root=str(tmp_path / "ok"))
+    server.skip_warm_up()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def post(task, body, ctype="application/json"):
+        conn = http.client.HTTPConnection(*server.server_address, timeout=5)
+        conn.request("POST", f"/{task}", body=body, headers={"Content-Type": ctype})
+        res = conn.getresponse()
+        return res.status, json.loads(res.read())
+
+    try:
+        assert post("image", b"\0" * 2048, "image/jpeg")[0] == 413
+        # Same answer whether or not the file outside the root exists
+        (tmp_path / "secret.jpg").write_bytes(b"x")
+        for path in ("../secret.jpg", "../missing.jpg", str(tmp_path / "secret.jpg")):
+            assert post("image", json.dumps({"path": path}).encode()) == (403, {"error": "Path not allowed"})
+        assert server.resolve_path("a/b.jpg") == str(tmp_path.resolve() / "ok" / "a" / "b.jpg")
+        # Wrong shapes are rejected before any model is loaded
+        for body in ({"texts": "abc"}, {"text": ["a", "b"]}, {"texts": ["a", 1]}, ["a"], "a"):
+            assert post("sentiment", json.dumps(body).encode())[0] == 400
+        assert post("image", json.dumps({"paths": "x.jpg"}).encode())[0] == 400
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_token_length_buckets():
+    from app.models.tokenization import TokenizationStage
+
+    stage = TokenizationStage(tokenizer=None)
+    mixed = [[0] * (8 + (i * 97) % 505) for i in range(40)]  # 8..512 tokens, shuffled
+    batches = list(stage.bucket(mixed, batch_size=32))
+    assert len(batches) <= 3 and all(len(b) <= 32 for b in batches)
+    assert sorted(i for b in batches for i in b) == list(range(40))
+    lengths = [[len(mixed[i]) for i in b] for b in batches]
+    assert all(a == sorted(a) for a in lengths) and lengths[0][-1] <= lengths[1][0]
+
+    same = [[0] * 20] * 70
+    assert [len(b) for b in stage.bucket(same, batch_size=32)] == [32, 32, 6]
+
+
+def test_image_batch_cache_disabled(tmp_path):
+    import contextlib
+    import threading
+    import pytest
+
+    Image = pytest.importorskip("PIL.Image")
+    from app.models.base import cache_disabled
+    from app.models.image_classifier import ImageClassifier
+
+    model = ImageClassifier.__new__(ImageClassifier)
+    model._model_id = "test"
+    model._geometry = None
+    model._decode_pool, model._decode_lock = None, threading.Lock()
+    model.variant_name = lambda: "test-cache-disabled"
+    model.model_revision = lambda: "test"
+    model._span = lambda stage: contextlib.nullcontext()
+    model.log = lambda *args, **kwargs: None
+    forwards = []
+
+    def run_pipe(images, batch_size=None):
+        forwards.append(len(images))
+        return [[{"label": "x", "score": 1.0}]] * len(images)
+
+    model._run_pipe = run_pipe
+    model._format = lambda res: res[0]["label"]
+
+    paths = []
+    for i in range(3):
+        paths.append(str(tmp_path / f"{i}.png"))
+        Image.new("RGB", (8, 8), (i, 0, 0)).save(paths[-1])
+    model.infer_batch(paths)
+    model.infer_batch(paths)                 # all cache hits
+    with cache_disabled():                   # lookups on the decode pool must miss too
+        model.infer_batch(paths)
+    assert forwards == [3, 3]
+
+
+def test_gui_task_follows_registry(monkeypatch):
+    from app.gui.tasks import SentimentTask
+    from app.models.registry import registry
+
+    class Echo:
+        def __init__(self, tag):
+            self.tag = tag
+
+        def infer(self, text):
+            return {"label": self.tag}
+
+    loaded = {"sentiment": Echo("first")}
+    monkeypatch.setattr(registry, "get", lambda task, model_id=None, **kw: loaded[task])
+    task = SentimentTask()
+    assert task.run("hi") == {"label": "first"}
+    loaded["sentiment"] = Echo("reloaded")  # unload() + get() hand out a new instance
+    assert task.run("hi") == {"label": "reloaded"} and "_model" not in vars(task)
+
+
 if __name__ == "__main__":
     test_sentiment()             # Run sentiment test
     print("-" * 60)
     try:
         test_image()             # Run image test
     except FileNotFoundError:    # if the image is not found then this messge will appeaers
-        print(" Please put a test image at assets/sample.jpg to run the image test.")
\ No newline at end of file
+        print(" Please put a test image at assets/sample.jpg to run the image test.")
@@ -0,0 +1,150 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+# Returned by LRUCache.get() on a miss so that falsy values can still be cached
+MISS = object()
+
+
+def approx_size(obj: Any) -> int:
+    # Rough deep size in bytes of the small dict/list/str results the models return
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+    return total
+
+
+class LRUCache:
+    """
+    Size-bounded LRU cache with optional TTL.
+    Lookups and inserts are O(1) (OrderedDict); eviction drops the least
+    recently used entries until both the entry and byte limits hold.
+    All public methods are thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, size, expires)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, MISS, _count=False) is not MISS
+
+    def get(self, key, default=MISS, _count: bool = True):
+        with self._lock:
+            return self._get(key, default, _count)
+
+    def _get(self, key, default, _count: bool):
+        item = self._data.get(key)
+        if item is None:
+            if _count:
+                self.misses += 1
+            return default
+        value, size, expires = item
+        if expires is not None and expires <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            if _count:
+                self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        if _count:
+            self.hits += 1
+        return value
+
+    def set(self, key, value) -> None:
+        # Keys hold whole input texts, so they count towards max_bytes too
+        size = approx_size(key) + approx_size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # would evict everything and still not fit
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, size, expires)
+            self._bytes += size
+            self._evict()
+
+    def _remove(self, key) -> None:
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        while self._data and (
+            len(self._data) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, (_, size, _) = self._data.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._stats()
+
+    def _stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Namespace (e.g. "SentimentModel:distilbert-...") -> LRUCache
+_namespaces: Dict[str, LRUCache] = {}
+_namespaces_lock = threading.Lock()
+
+
+def get_namespace(name: str, **limits) -> LRUCache:
+    """Return the cache for a namespace, creating it with `limits` on first use."""
+    cache = _namespaces.get(name)
+    if cache is None:
+        with _namespaces_lock:
+            cache = _namespaces.get(name)
+            if cache is None:
+                cache = _namespaces[name] = LRUCache(**limits)
+    return cache
+
+
+def all_stats() -> Dict[str, Dict[str, Any]]:
+    with _namespaces_lock:
+        caches = list(_namespaces.items())
+    return {name: cache.stats() for name, cache in caches}
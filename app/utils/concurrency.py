@@ -0,0 +1,69 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Overridable from the environment so deployments can size things per box
+_WORKERS_ENV = "APP_INFER_WORKERS"
+_TORCH_THREADS_ENV = "APP_TORCH_THREADS"
+
+_executor = None
+_executor_lock = threading.Lock()
+_torch_configured = False
+
+
+def cpu_count() -> int:
+    # Respect CPU affinity / container limits where the OS exposes them
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def default_workers() -> int:
+    """Inference threads: one per model call in flight, never more than the cores."""
+    env = os.environ.get(_WORKERS_ENV)
+    if env:
+        return max(1, int(env))
+    return max(1, min(4, cpu_count()))
+
+
+def torch_threads(workers: int | None = None) -> int:
+    """
+    Intra-op threads per forward pass. `workers` is the number of forward
+    passes that really run at the same time (e.g. replica processes); they
+    share the cores. Without it one pass gets every core.
+    """
+    env = os.environ.get(_TORCH_THREADS_ENV)
+    if env:
+        return max(1, int(env))
+    return max(1, cpu_count() // (workers or 1))
+
+
+def configure_torch_threads(workers: int | None = None, force: bool = False) -> None:
+    """
+    Split the cores between forward passes that run in parallel, e.g. the
+    replicas of ProcessReplicaPool. In one process each model serialises its
+    own forward passes, so without `workers` (or $APP_TORCH_THREADS) torch's
+    default of one thread per core is kept. Runs once per process (unless
+    `force`, e.g. in a forked worker) and is a no-op when torch isn't installed.
+    """
+    global _torch_configured
+    if _torch_configured and not force:
+        return
+    if workers is None and not os.environ.get(_TORCH_THREADS_ENV):
+        return
+    _torch_configured = True
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(torch_threads(workers))
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Shared pool for running inferences off the caller's thread (GUI, async code)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=default_workers(), thread_name_prefix="infer")
+        return _executor
@@ -1,15 +1,19 @@
 import time                    
 from functools import wraps    
+from app.utils.metrics import metrics
 
 def timed(fn):
-    # This decorator  measure how long a function take to run  and add  elapsed time 
+    # This decorator  measure how long a method take to run (monotonic perf_counter_ns)
+    # and records it in the metrics histogram "<model>/<method>". The result itself is
+    # not touched, so cached dicts are never mutated and payloads carry no timings.
     @wraps(fn)
-    def wrapper(*args, **kwargs):
-        t = time.time()        #  start time is recoreded
-        out = fn(*args, **kwargs)   #functons runs here
-        if isinstance(out, dict):  
-            out["_elapsed_sec"] = round(time.time() - t, 3)
-        return out              # Return the result 
+    def wrapper(self, *args, **kwargs):
+        t = time.perf_counter_ns()        #  start time is recoreded
+        try:
+            return fn(self, *args, **kwargs)   #functons runs here
+        finally:
+            name = self.variant_name() if hasattr(self, "variant_name") else type(self).__name__
+            metrics.observe(name, fn.__name__, (time.perf_counter_ns() - t) / 1e9)
     return wrapper              #
 
 def validate_input(expected_types):
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Set to a file path to turn the disk tier on without code changes
+_DB_ENV = "APP_CACHE_DB"
+_MAX_BYTES_ENV = "APP_CACHE_DB_MAX_BYTES"
+_DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key      TEXT PRIMARY KEY,
+    value    TEXT NOT NULL,
+    size     INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed);
+"""
+
+
+class DiskCache:
+    """
+    SQLite-backed result cache shared by every process on the machine.
+
+    WAL mode lets readers run alongside one writer, each thread uses its own
+    connection, and once the stored values exceed `max_bytes` the least
+    recently accessed rows are deleted. Values must be JSON serialisable.
+    """
+
+    # Re-check the size limit every N writes rather than on each one
+    _EVICT_EVERY = 256
+    # Access times of hits are buffered and written in one statement once
+    # this many are pending or _TOUCH_INTERVAL seconds have passed
+    _TOUCH_EVERY = 64
+    _TOUCH_INTERVAL = 5.0
+
+    def __init__(self, path: str, max_bytes: int = _DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self._touched: Dict[str, float] = {}  # key -> last hit time, not yet written
+        self._touched_at = time.monotonic()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # A connection must never cross a fork, so it is keyed by pid as well
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def make_key(namespace: str, key: Any) -> str:
+        # namespace carries model id + revision so a new model never reads old results
+        return hashlib.blake2b(f"{namespace}\x00{key!r}".encode(), digest_size=20).hexdigest()
+
+    def get(self, namespace: str, key: Any) -> Optional[Any]:
+        k = self.make_key(namespace, key)
+        conn = self._conn()
+        row = conn.execute("SELECT value FROM cache WHERE key = ?", (k,)).fetchone()
+        if row is None:
+            return None
+        with self._writes_lock:
+            self._touched[k] = time.time()
+            flush = (
+                len(self._touched) >= self._TOUCH_EVERY
+                or time.monotonic() - self._touched_at >= self._TOUCH_INTERVAL
+            )
+        if flush:
+            self.flush_access_times()
+        return json.loads(row[0])
+
+    def flush_access_times(self) -> None:
+        """Write buffered hit times in one statement (they only guide eviction)."""
+        with self._writes_lock:
+            touched, self._touched = self._touched, {}
+            self._touched_at = time.monotonic()
+        if not touched:
+            return
+        try:
+            self._conn().executemany(
+                "UPDATE cache SET accessed = ? WHERE key = ?",
+                [(t, k) for k, t in touched.items()],
+            )
+        except sqlite3.OperationalError:
+            pass  # database busy; losing a few access times is harmless
+
+    def set(self, namespace: str, key: Any, value: Any) -> None:
+        data = json.dumps(value)
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cache (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+            (self.make_key(namespace, key), data, len(data), time.time()),
+        )
+        with self._writes_lock:
+            self._writes += 1
+            check = self._writes % self._EVICT_EVERY == 0
+        if check:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently accessed rows until under max_bytes; returns rows removed."""
+        self.flush_access_times()
+        conn = self._conn()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        removed = 0
+        while total > self.max_bytes:
+            rows = conn.execute(
+                "SELECT key, size FROM cache ORDER BY accessed LIMIT 256"
+            ).fetchall()
+            if not rows:
+                break
+            # Only as many as needed, not the whole block of 256
+            victims = []
+            for k, size in rows:
+                if total <= self.max_bytes:
+                    break
+                victims.append((k,))
+                total -= size
+            conn.executemany("DELETE FROM cache WHERE key = ?", victims)
+            removed += len(victims)
+        return removed
+
+    def stats(self) -> dict:
+        count, size = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache"
+        ).fetchone()
+        return {"path": self.path, "entries": count, "bytes": size, "max_bytes": self.max_bytes}
+
+    def clear(self) -> None:
+        self._conn().execute("DELETE FROM cache")
+
+
+_disk_cache: Optional[DiskCache] = None
+_configured = False
+_lock = threading.Lock()
+
+
+def configure_disk_cache(path: Optional[str], max_bytes: int = _DEFAULT_MAX_BYTES) -> Optional[DiskCache]:
+    """Enable (or with path=None disable) the process-wide disk tier."""
+    global _disk_cache, _configured
+    with _lock:
+        _disk_cache = DiskCache(path, max_bytes) if path else None
+        _configured = True
+        return _disk_cache
+
+
+def get_disk_cache() -> Optional[DiskCache]:
+    """The configured disk tier, or None. Falls back to $APP_CACHE_DB on first call."""
+    if not _configured:
+        path = os.environ.get(_DB_ENV)
+        max_bytes = int(os.environ.get(_MAX_BYTES_ENV, _DEFAULT_MAX_BYTES))
+        configure_disk_cache(path, max_bytes)
+    return _disk_cache
@@ -0,0 +1,50 @@
+import hashlib
+import os
+
+from app.utils.cache import MISS, LRUCache
+
+_CHUNK = 1 << 20  # read files 1 MiB at a time
+
+# abs path -> (mtime_ns, size, digest); lets unchanged files skip re-hashing.
+# Bounded so a long-running server walking many folders doesn't grow forever.
+_file_digests = LRUCache(max_entries=65536)
+
+
+def _hasher():
+    return hashlib.blake2b(digest_size=16)
+
+
+def file_digest(path: str) -> str:
+    """
+    Content hash of a file's raw bytes.
+    If mtime and size are unchanged since the last call the previous digest is
+    reused, so repeated lookups of the same file cost one stat().
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    memo = _file_digests.get(path)
+    if memo is not MISS and memo[0] == st.st_mtime_ns and memo[1] == st.st_size:
+        return memo[2]
+
+    h = _hasher()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_CHUNK), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    _file_digests.set(path, (st.st_mtime_ns, st.st_size, digest))
+    return digest
+
+
+def bytes_digest(data: bytes) -> str:
+    """Content hash of an in-memory encoded file; equals file_digest() of the same bytes."""
+    h = _hasher()
+    h.update(data)
+    return h.hexdigest()
+
+
+def image_digest(img) -> str:
+    """Content hash of a decoded PIL image (mode + size + pixel bytes)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{img.mode}:{img.size[0]}x{img.size[1]}:".encode())
+    h.update(img.tobytes())
+    return h.hexdigest()
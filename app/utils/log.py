@@ -0,0 +1,175 @@
+"""
+Structured, non-blocking logging for the models.
+
+Callers only build a LogRecord and enqueue it; a QueueListener thread does the
+formatting (JSON by default) and the stream write. Per-request events can be
+sampled so a busy server logs, say, 1% of them.
+
+Environment defaults (configure_logging() overrides them):
+    APP_LOG_LEVEL   INFO, DEBUG, WARNING, ...      (default INFO)
+    APP_LOG_FORMAT  json | text                    (default json)
+    APP_LOG_SAMPLE  0.0-1.0, share of sampled events kept (default 1.0)
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from typing import Any, Dict
+
+ROOT_LOGGER = "app"
+
+_lock = threading.Lock()
+_state: Dict[str, Any] = {}  # listener, handler and the arguments they were built with
+_sample_rate = 1.0
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, event, pid, thread, detail."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        out = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+            + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+            "pid": record.process,
+            "thread": record.threadName,
+        }
+        detail = getattr(record, "detail", None)
+        if detail:
+            out["detail"] = detail
+        if record.exc_info:
+            out["exc"] = self.formatException(record.exc_info)
+        return json.dumps(out, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines in the old console style: [LEVEL] event :: detail"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = f"[{record.levelname}] {record.getMessage()} :: {getattr(record, 'detail', None) or {}}"
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    # Never blocks the caller: a full queue drops the record and counts it.
+    # prepare() is a no-op so formatting happens on the listener thread.
+    dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            type(self).dropped += 1
+
+
+def configure_logging(
+    level: str | int | None = None,
+    fmt: str | None = None,
+    sample_rate: float | None = None,
+    stream=None,
+    max_queue: int = 10000,
+) -> None:
+    """
+    (Re)install the queue handler on the "app" logger. Safe to call again,
+    e.g. from a CLI flag; the previous listener is flushed and stopped.
+    """
+    level = level or os.environ.get("APP_LOG_LEVEL", "INFO")
+    fmt = fmt or os.environ.get("APP_LOG_FORMAT", "json")
+    if sample_rate is None:
+        sample_rate = float(os.environ.get("APP_LOG_SAMPLE", "1.0"))
+    if fmt not in ("json", "text"):
+        raise ValueError(f"Unknown log format {fmt!r}, expected 'json' or 'text'")
+    with _lock:
+        _install_locked(level, fmt, sample_rate, stream, max_queue)
+
+
+def _install_locked(level, fmt, sample_rate, stream, max_queue) -> None:
+    global _sample_rate
+    _stop_locked()
+    sink = logging.StreamHandler(stream or sys.stderr)
+    sink.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+    q = queue.Queue(maxsize=max_queue)
+    handler = _DroppingQueueHandler(q)
+    listener = logging.handlers.QueueListener(q, sink)
+    listener.start()
+
+    logger = logging.getLogger(ROOT_LOGGER)
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+    _sample_rate = max(0.0, min(1.0, sample_rate))
+    _state.update(
+        listener=listener, handler=handler,
+        args=(level, fmt, sample_rate, stream, max_queue),
+    )
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    with _lock:
+        _stop_locked()
+
+
+def _stop_locked() -> None:
+    listener, handler = _state.pop("listener", None), _state.pop("handler", None)
+    if handler is not None:
+        logging.getLogger(ROOT_LOGGER).removeHandler(handler)
+    if listener is not None:
+        listener.stop()  # drains the queue before returning
+
+
+def _restart_in_child() -> None:
+    # The listener thread doesn't survive fork(); give worker processes their own
+    global _lock
+    _lock = threading.Lock()
+    _state.pop("listener", None)
+    handler = _state.pop("handler", None)
+    if handler is not None:
+        logging.getLogger(ROOT_LOGGER).removeHandler(handler)
+        _install_locked(*_state["args"])
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_in_child)
+atexit.register(shutdown_logging)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """A logger under "app" so it goes through the queue handler."""
+    if "args" not in _state:  # first use: configure from the environment
+        configure_logging()
+    if name != ROOT_LOGGER and not name.startswith(ROOT_LOGGER + "."):
+        name = f"{ROOT_LOGGER}.{name}"
+    return logging.getLogger(name)
+
+
+def log_event(
+    logger: logging.Logger, event: str, detail: Dict[str, Any] | None = None,
+    sampled: bool = False, level: int = logging.INFO,
+) -> None:
+    """
+    Emit one structured event. The level check and sampling happen before any
+    record is built; the detail dict is only serialised on the listener thread.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if sampled and _sample_rate < 1.0 and random.random() >= _sample_rate:
+        return
+    logger.log(level, event, extra={"detail": detail})
+
+
+def dropped_records() -> int:
+    return _DroppingQueueHandler.dropped
@@ -0,0 +1,120 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+# Histogram bucket upper bounds in seconds (Prometheus style, +Inf implied)
+BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; observe() is O(log buckets)."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        # Upper bound of the bucket holding the q-th observation
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets + (self.max,), self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum_sec": round(self.sum, 6),
+            "mean_ms": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            "min_ms": round(self.min * 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+            "p50_ms": round(self.quantile(0.5) * 1000, 3),
+            "p95_ms": round(self.quantile(0.95) * 1000, 3),
+            "p99_ms": round(self.quantile(0.99) * 1000, 3),
+        }
+
+
+class Metrics:
+    """
+    Per-model, per-stage latency histograms.
+    Stages used by the models: cache_lookup, preprocess, forward,
+    postprocess, plus one per public entry point (infer, infer_batch, ...).
+    """
+
+    def __init__(self):
+        self._hists: Dict[Tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, model: str, stage: str, seconds: float) -> None:
+        with self._lock:
+            hist = self._hists.get((model, stage))
+            if hist is None:
+                hist = self._hists[(model, stage)] = Histogram()
+            hist.observe(seconds)
+
+    @contextmanager
+    def span(self, model: str, stage: str):
+        t = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.observe(model, stage, (time.perf_counter_ns() - t) / 1e9)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hists.clear()
+
+    def to_json(self, model: str | None = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """{model: {stage: snapshot}}, optionally for one model only."""
+        out: Dict[str, Dict[str, Dict[str, float]]] = {}
+        with self._lock:
+            for (m, stage), hist in sorted(self._hists.items()):
+                if model is None or m == model:
+                    out.setdefault(m, {})[stage] = hist.snapshot()
+        return out
+
+    def to_prometheus(self, name: str = "inference_stage_seconds") -> str:
+        """Prometheus text exposition format."""
+        lines = [
+            f"# HELP {name} Inference latency by model and stage.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            for (model, stage), hist in sorted(self._hists.items()):
+                labels = f'model="{_escape(model)}",stage="{_escape(stage)}"'
+                cumulative = 0
+                for bound, n in zip(hist.buckets, hist.counts):
+                    cumulative += n
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+                lines.append(f"{name}_sum{{{labels}}} {hist.sum}")
+                lines.append(f"{name}_count{{{labels}}} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Process-wide metrics used by @timed and the model stage spans
+metrics = Metrics()
@@ -0,0 +1,124 @@
+import csv
+import hashlib
+import itertools
+import json
+import os
+import sys
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp")
+
+
+def read_text_records(
+    source: str, text_field: str = "text", id_field: str = "id"
+) -> Iterator[Tuple[object, str]]:
+    """
+    Stream (id, text) pairs from a JSONL file, a CSV file, a plain text file
+    (one text per line) or '-' for stdin. Nothing is read ahead, so memory
+    stays constant regardless of input size. Records without an id get their
+    0-based position.
+    """
+    ext = os.path.splitext(source)[1].lower()
+    # newline="" is for the csv module only; elsewhere it would leave "\r" on CRLF lines
+    fh = sys.stdin if source == "-" else open(
+        source, encoding="utf-8", newline="" if ext == ".csv" else None
+    )
+    try:
+        if ext == ".csv":
+            rows: Iterable = csv.DictReader(fh)
+        elif ext in (".jsonl", ".ndjson") or source == "-":
+            rows = _json_or_plain_lines(fh)
+        else:
+            rows = ({text_field: line.rstrip("\n")} for line in fh if line.strip())
+
+        for n, row in enumerate(rows):
+            if isinstance(row, str):
+                row = {text_field: row}
+            if text_field not in row:
+                raise ValueError(f"Record {n} has no '{text_field}' field")
+            yield row.get(id_field, n), row[text_field]
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+
+
+def _json_or_plain_lines(fh) -> Iterator[object]:
+    # stdin may carry JSONL or bare lines; decide per line
+    for line in fh:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            yield json.loads(line)
+        else:
+            yield line
+
+
+def iter_image_files(directory: str) -> Iterator[Tuple[str, str]]:
+    """Yield (id, path) for every image under `directory`, in a stable order."""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, directory), path
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class Checkpoint:
+    """
+    Records how many input records have been fully written so an interrupted
+    bulk run can resume. Saved atomically after every batch, together with the
+    input's path, size and mtime: resuming against a different or modified
+    input would skip the wrong records, so load() refuses to.
+    """
+
+    def __init__(self, path: Optional[str], source: Optional[str] = None):
+        self.path = path
+        self.source = _fingerprint(source) if path and source else None
+
+    def load(self) -> int:
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        with open(self.path, encoding="utf-8") as fh:
+            state = json.load(fh)
+        if state.get("source") != self.source:
+            raise ValueError(
+                f"Checkpoint {self.path} belongs to a different or modified input "
+                f"({state.get('source')}); delete it to start over"
+            )
+        return int(state.get("done", 0))
+
+    def save(self, done: int) -> None:
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"done": done, "source": self.source}, fh)
+        os.replace(tmp, self.path)
+
+
+def _fingerprint(source: str) -> dict:
+    # stdin can't be checked; files by absolute path, size and mtime
+    if source == "-":
+        return {"path": "-"}
+    if os.path.isdir(source):
+        # A folder's own mtime misses changes in subfolders, so hash the list
+        # of images a run would walk, in the order it walks them
+        h = hashlib.blake2b(digest_size=16)
+        count = 0
+        for rel, path in iter_image_files(source):
+            st = os.stat(path)
+            h.update(f"{rel}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+            count += 1
+        return {"path": os.path.abspath(source), "files": count, "digest": h.hexdigest()}
+    st = os.stat(source)
+    return {"path": os.path.abspath(source), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
@@ -1,38 +1,185 @@
 # cli.py
 import argparse
-from PIL import Image
-from app.models.sentiment_model import SentimentModel
-from app.models.image_model import ImageClassifier
+import itertools
+import json
+import sys
 
+# Model, PIL and streaming imports live inside the functions that need them so
+# `--help`, argument errors and the sentiment path start without vision/torch code.
 
-def run_sentiment(text: str):
-    m = SentimentModel()
-    res = m.infer(text)
+
+def run_sentiment(text: str, quantize: bool = False, backend: str = "torch", long_mode: str = None):
+    from app.models.registry import registry
+
+    m = registry.get("sentiment", quantize=quantize, backend=backend)
+    # long_mode is the window aggregation ("mean", "weighted", "max") for long documents
+    res = m.infer_long(text, aggregate=long_mode) if long_mode else m.infer(text)
     print(res)
 
 
-def run_image(path: str):
-    img = Image.open(path)
-    m = ImageClassifier()
-    res = m.infer(img)
+def run_image(path: str, quantize: bool = False, backend: str = "torch"):
+    from app.models.registry import registry
+
+    m = registry.get("image", quantize=quantize, backend=backend)
+    res = m.infer(path)  # a path, so the model can hash the file and draft-decode it
     print(res)
 
 
+def run_bulk(
+    task: str, records, output: str, batch_size: int = None, checkpoint: str = None,
+    processes: int = 0, quantize: bool = False, backend: str = "torch", long_mode: str = None,
+    source: str = None,
+):
+    """
+    Stream (id, input) records through the model's batched path and write one
+    JSON line per record as soon as its batch finishes. With a checkpoint the
+    run can be interrupted and restarted without redoing finished records;
+    `source` (the input file or folder) is recorded so a checkpoint is never
+    resumed against different input.
+    A failing chunk is retried item by item; records that still fail get an
+    {"id", "error"} line so one corrupt file doesn't stop the run.
+    With processes > 0 each chunk is spread over that many model replicas.
+    """
+    from app.models.registry import registry
+    from app.utils.streaming import Checkpoint, chunked
+
+    ckpt = Checkpoint(checkpoint, source)
+    done = ckpt.load()
+    records = itertools.islice(records, done, None)  # skip what a previous run wrote
+
+    # Append when resuming so earlier results are kept
+    out = sys.stdout if output == "-" else open(output, "a" if done else "w", encoding="utf-8")
+    pool = None
+    try:
+        if processes:
+            from app.models.process_pool import ProcessReplicaPool
+
+            model = pool = ProcessReplicaPool(
+                task, workers=processes, batch_size=batch_size, quantize=quantize,
+                backend=backend,
+            )
+            chunk_size = pool.batch_size * processes  # one batch per worker per round
+        else:
+            model = registry.get(task, quantize=quantize, backend=backend)
+            chunk_size = batch_size = batch_size or model.batch_size
+
+        def run(items):
+            if long_mode:  # each document is windowed and batched on its own
+                return [model.infer_long(data, aggregate=long_mode) for data in items]
+            return model.infer_batch(items, batch_size=batch_size)
+
+        for chunk in chunked(records, chunk_size):
+            try:
+                rows = [{"id": rid, **res} for (rid, _), res in zip(chunk, run([d for _, d in chunk]))]
+            except Exception:
+                rows = []
+                for rid, data in chunk:
+                    try:
+                        rows.append({"id": rid, **run([data])[0]})
+                    except Exception as e:
+                        rows.append({"id": rid, "error": str(e) or type(e).__name__})
+            for row in rows:
+                out.write(json.dumps(row) + "\n")
+            out.flush()
+            done += len(chunk)
+            ckpt.save(done)
+    finally:
+        if pool is not None:
+            pool.close()
+        if out is not sys.stdout:
+            out.close()
+    return done
+
+
+def run_export_onnx(task: str, model_id: str = None, out_dir: str = None, opset: int = 17):
+    from app.models.backends import export_onnx
+    from app.models.registry import _model_class
+
+    cls = _model_class(task)
+    out = export_onnx(cls.HF_TASK, model_id or cls.DEFAULT_MODEL_ID, out_dir, opset)
+    print(f"Exported {task} model to {out}")
+
+
 def main():
     p = argparse.ArgumentParser(description="Run sentiment or image classification")
     sub = p.add_subparsers(dest="cmd", required=True)
 
     sp_s = sub.add_parser("sentiment", help="Classify sentiment of a text")
-    sp_s.add_argument("--text", required=True)
+    src_s = sp_s.add_mutually_exclusive_group(required=True)
+    src_s.add_argument("--text")
+    src_s.add_argument(
+        "--input", help="JSONL, CSV or text file (one record per line), or '-' for stdin"
+    )
+    sp_s.add_argument("--text-field", default="text", help="Field holding the text in JSONL/CSV")
+    sp_s.add_argument("--id-field", default="id", help="Field holding the record id in JSONL/CSV")
+    sp_s.add_argument(
+        "--long", nargs="?", const="mean", choices=["mean", "weighted", "max"],
+        help="Score long documents over sliding token windows, aggregated this way (default: mean)",
+    )
 
     sp_i = sub.add_parser("image", help="Classify an image file")
-    sp_i.add_argument("--path", required=True)
+    src_i = sp_i.add_mutually_exclusive_group(required=True)
+    src_i.add_argument("--path")
+    src_i.add_argument("--dir", help="Classify every image under this directory")
+
+    sp_e = sub.add_parser("export-onnx", help="Export a model for the ONNX Runtime backend")
+    sp_e.add_argument("--task", choices=["sentiment", "image"], required=True)
+    sp_e.add_argument("--model-id", help="Defaults to the task's built-in model")
+    sp_e.add_argument("--out", help="Output directory (default: $APP_ONNX_DIR/<model id>)")
+    sp_e.add_argument("--opset", type=int, default=17)
+
+    for sp in (sp_s, sp_i):
+        sp.add_argument("--output", default="-", help="JSONL output file for bulk runs (default: stdout)")
+        sp.add_argument("--batch-size", type=int, help="Records per forward pass (default: model's own)")
+        sp.add_argument("--checkpoint", help="File used to resume an interrupted bulk run")
+        sp.add_argument(
+            "--cache-db", help="SQLite file for a persistent result cache shared across runs"
+        )
+        sp.add_argument(
+            "--quantize", action="store_true",
+            help="Run with dynamic INT8 quantization of Linear layers (CPU)",
+        )
+        sp.add_argument(
+            "--backend", choices=["torch", "onnx"], default="torch",
+            help="onnx needs a prior `export-onnx` for the task",
+        )
+        sp.add_argument(
+            "--processes", type=int, default=0,
+            help="Bulk runs: worker processes, each with its own model replica (0 = in-process)",
+        )
 
     args = p.parse_args()
+    if getattr(args, "long", None) and args.processes:
+        p.error("--long runs in-process; drop --processes")
+    if args.cmd == "export-onnx":
+        run_export_onnx(args.task, args.model_id, args.out, args.opset)
+        return
+
+    from app.utils.streaming import iter_image_files, read_text_records
+
+    if args.cache_db:
+        from app.utils.disk_cache import configure_disk_cache
+
+        configure_disk_cache(args.cache_db)
+
     if args.cmd == "sentiment":
-        run_sentiment(args.text)
+        if args.input:
+            records = read_text_records(args.input, args.text_field, args.id_field)
+            run_bulk(
+                "sentiment", records, args.output, args.batch_size, args.checkpoint,
+                args.processes, args.quantize, args.backend, args.long, source=args.input,
+            )
+        else:
+            run_sentiment(args.text, args.quantize, args.backend, args.long)
     elif args.cmd == "image":
-        run_image(args.path)
+        if args.dir:
+            run_bulk(
+                "image", iter_image_files(args.dir), args.output, args.batch_size,
+                args.checkpoint, args.processes, args.quantize, args.backend,
+                source=args.dir,
+            )
+        else:
+            run_image(args.path, args.quantize, args.backend)
 
 
 if __name__ == "__main__":
@@ -14,7 +14,7 @@ def check_tkinter_gui_with_oop():
     print("\n1️⃣ Multiple Inheritance:")
     try:
         from app.models.sentiment_model import SentimentModel
-        from app.models.image_model import ImageClassifier
+        from app.models.image_classifier import ImageClassifier
 
         # Check SentimentModel inheritance
         sentiment_bases = SentimentModel.__bases__
@@ -125,7 +125,7 @@ def check_huggingface_models():
 
     try:
         from app.models.sentiment_model import SentimentModel
-        from app.models.image_model import ImageClassifier
+        from app.models.image_classifier import ImageClassifier
 
         print("\n1️⃣ Model 1 - Sentiment Analysis:")
         print("   Category: Natural Language Processing (NLP)")